@@ -0,0 +1,203 @@
+"""
+Precomputed aggregates for Private Laws Dashboard
+"""
+
+import numpy as np
+
+
+def category_membership(masks, n_categories, dtype=np.float32):
+    """Expand int64 category bitmasks into an (n_categories, n_rows) 0/1 matrix."""
+    shifts = np.arange(n_categories, dtype=np.int64)
+    return ((np.asarray(masks, dtype=np.int64)[None, :] >> shifts[:, None]) & 1).astype(dtype)
+
+
+class CategoryCounter:
+    """Per-category row counts for any row subset, from a precomputed membership matrix."""
+    
+    def __init__(self, masks, categories):
+        self.categories = list(categories)
+        self.membership = category_membership(masks, len(self.categories))
+        self._totals = self.membership.sum(axis=1)
+    
+    def counts(self, rows=None):
+        """Counts keyed by category, in category order.
+        
+        rows may be None (all rows), a boolean mask, a slice or an array of positions.
+        """
+        if rows is None:
+            totals = self._totals
+        elif isinstance(rows, np.ndarray) and rows.dtype == bool:
+            # A single matrix-vector product instead of materializing the selected rows
+            totals = self.membership @ rows.astype(np.float32)
+        else:
+            totals = self.membership[:, rows].sum(axis=1)
+        return dict(zip(self.categories, np.rint(totals).astype(int).tolist()))
+
+
+class YearCategoryCube:
+    """Cumulative year x category counts, so any year-range breakdown is two row lookups."""
+    
+    def __init__(self, years, masks, categories):
+        self.categories = list(categories)
+        years = np.asarray(years, dtype=np.int64)
+        self.first_year = int(years.min()) if len(years) else 0
+        n_years = int(years.max()) - self.first_year + 1 if len(years) else 0
+        
+        membership = category_membership(masks, len(self.categories), dtype=np.int64)
+        per_year = np.zeros((n_years + 1, len(self.categories)), dtype=np.int64)
+        for i, row in enumerate(membership):
+            per_year[1:, i] = np.bincount(years - self.first_year, weights=row, minlength=n_years)
+        
+        # cumulative[y] = counts for all years before first_year + y
+        self.cumulative = per_year.cumsum(axis=0)
+    
+    def counts(self, start_year, end_year):
+        """Counts keyed by category for laws dated start_year..end_year inclusive."""
+        n_years = len(self.cumulative) - 1
+        lo = min(max(start_year - self.first_year, 0), n_years)
+        hi = min(max(end_year - self.first_year + 1, lo), n_years)
+        totals = self.cumulative[hi] - self.cumulative[lo]
+        return dict(zip(self.categories, totals.tolist()))
+
+
+class ValueHistograms:
+    """Per-value row counts of several columns for any row subset, in a single bincount pass.
+    
+    Each column is coded against its sorted distinct values, offset so the codes of
+    all columns share one bin space; missing values go to a trailing discard bin.
+    """
+    
+    def __init__(self, columns):
+        self.names = list(columns)
+        self.values = {}
+        codes = []
+        offset = 0
+        for name in self.names:
+            values = np.asarray(columns[name])
+            present = ~np.isnan(values) if values.dtype.kind == 'f' else np.ones(len(values), dtype=bool)
+            distinct, inverse = np.unique(values[present], return_inverse=True)
+            column_codes = np.full(len(values), -1, dtype=np.int64)
+            column_codes[present] = inverse + offset
+            codes.append(column_codes)
+            self.values[name] = distinct
+            offset += len(distinct)
+        
+        self._n_bins = offset
+        self._bounds = np.cumsum([0] + [len(self.values[name]) for name in self.names])
+        codes = np.column_stack(codes) if codes else np.empty((0, 0), dtype=np.int64)
+        codes[codes < 0] = self._n_bins
+        self._codes = codes
+        self._full = self._split(np.bincount(codes.ravel(), minlength=self._n_bins + 1))
+    
+    def counts(self, rows=None):
+        """{column: (values, counts)} for the values present in rows, values ascending.
+        
+        rows may be None (all rows, precomputed), a slice or an array of positions.
+        """
+        if rows is None:
+            return self._full
+        return self._split(np.bincount(self._codes[rows].ravel(), minlength=self._n_bins + 1))
+    
+    def _split(self, totals):
+        result = {}
+        for i, name in enumerate(self.names):
+            column_totals = totals[self._bounds[i]:self._bounds[i + 1]]
+            present = column_totals > 0
+            result[name] = (self.values[name][present], column_totals[present])
+        return result
+
+
+class StatsCube:
+    """Law counts per (year, congress) pair x subject x relief, built once so queries never touch rows.
+    
+    Both category axes end with an 'any' slot counting every law once, so a cell
+    answers "laws in this pair with subject s and relief r" for any combination
+    of specific and unrestricted categories. Multi-category laws count once per
+    category they carry, as in the breakdown charts.
+    """
+    
+    GROUPS = ('year', 'congress', 'subject', 'relief')
+    
+    def __init__(self, years, congresses, subject_masks, relief_masks, subjects, reliefs):
+        self.subjects = list(subjects)
+        self.reliefs = list(reliefs)
+        years = np.asarray(years, dtype=np.int64)
+        congresses = np.asarray(congresses, dtype=np.float64)
+        
+        # Pair codes; a missing congress becomes its own pair per year
+        congress_keys = np.where(np.isnan(congresses), -1.0, congresses)
+        pairs, pair_codes = np.unique(np.column_stack([years.astype(np.float64), congress_keys]), axis=0, return_inverse=True)
+        pair_codes = pair_codes.ravel()
+        self.pair_years = pairs[:, 0].astype(np.int64)
+        self.pair_congresses = np.where(pairs[:, 1] == -1.0, np.nan, pairs[:, 1])
+        
+        # Distinct years and congresses, and each pair's slot in them, for grouping
+        self.years, self.pair_year_codes = np.unique(self.pair_years, return_inverse=True)
+        self.congresses, self.pair_congress_codes = np.unique(pairs[:, 1], return_inverse=True)
+        self.congresses = np.where(self.congresses == -1.0, np.nan, self.congresses)
+        
+        subject_member = self._with_any(category_membership(subject_masks, len(self.subjects), dtype=np.int64))
+        relief_member = self._with_any(category_membership(relief_masks, len(self.reliefs), dtype=np.int64))
+        
+        self.cube = np.zeros((len(pairs), len(self.subjects) + 1, len(self.reliefs) + 1), dtype=np.int64)
+        order = np.argsort(pair_codes, kind='stable')
+        bounds = np.searchsorted(pair_codes[order], np.arange(len(pairs) + 1))
+        for p in range(len(pairs)):
+            rows = order[bounds[p]:bounds[p + 1]]
+            self.cube[p] = subject_member[:, rows] @ relief_member[:, rows].T
+    
+    @staticmethod
+    def _with_any(membership):
+        """Membership matrix with an extra all-ones 'any' row."""
+        return np.vstack([membership, np.ones((1, membership.shape[1]), dtype=membership.dtype)])
+    
+    def counts(self, year_range=None, congress_range=None, subject=None, relief=None, group_by=()):
+        """Total and per-group counts for the filters.
+        
+        year_range / congress_range are inclusive (lo, hi) pairs or None, subject and
+        relief are category names or None, and group_by is a sequence drawn from
+        GROUPS. Returns (total, [(keys tuple in group_by order, count), ...]) with
+        zero counts left out.
+        """
+        group_by = tuple(group_by)
+        
+        pair_mask = np.ones(len(self.pair_years), dtype=bool)
+        if year_range is not None:
+            pair_mask &= (self.pair_years >= year_range[0]) & (self.pair_years <= year_range[1])
+        if congress_range is not None:
+            pair_mask &= (self.pair_congresses >= congress_range[0]) & (self.pair_congresses <= congress_range[1])
+        
+        any_subject, any_relief = len(self.subjects), len(self.reliefs)
+        subject_slots = [self.subjects.index(subject)] if subject else (
+            list(range(any_subject)) if 'subject' in group_by else [any_subject])
+        relief_slots = [self.reliefs.index(relief)] if relief else (
+            list(range(any_relief)) if 'relief' in group_by else [any_relief])
+        
+        cells = self.cube[pair_mask][:, subject_slots][:, :, relief_slots]
+        total = int(self.cube[pair_mask][:, subject_slots[0] if subject else any_subject,
+                                         relief_slots[0] if relief else any_relief].sum())
+        
+        # Collapse the pair axis to the requested time grouping, keeping one key column per time group
+        if 'year' in group_by and 'congress' in group_by:
+            columns = {'year': self.pair_years[pair_mask], 'congress': self.pair_congresses[pair_mask]}
+        elif 'year' in group_by or 'congress' in group_by:
+            name = 'year' if 'year' in group_by else 'congress'
+            codes = (self.pair_year_codes if name == 'year' else self.pair_congress_codes)[pair_mask]
+            labels = self.years if name == 'year' else self.congresses
+            present = np.unique(codes)
+            grouped = np.zeros((len(labels),) + cells.shape[1:], dtype=np.int64)
+            np.add.at(grouped, codes, cells)
+            cells = grouped[present]
+            columns = {name: labels[present]}
+        else:
+            cells = cells.sum(axis=0, keepdims=True)
+            columns = {}
+        columns = {name: values.tolist() for name, values in columns.items()}
+        columns['subject'] = [self.subjects[slot] if slot < any_subject else None for slot in subject_slots]
+        columns['relief'] = [self.reliefs[slot] if slot < any_relief else None for slot in relief_slots]
+        
+        i, j, k = np.nonzero(cells)
+        axis = {'year': i, 'congress': i, 'subject': j, 'relief': k}
+        keys = zip(*[[columns[name][n] for n in axis[name].tolist()] for name in group_by]) if group_by else [()] * len(i)
+        groups = list(zip(keys, cells[i, j, k].tolist()))
+        return total, groups
@@ -0,0 +1,191 @@
+"""
+Read-only JSON API for Private Laws Dashboard
+"""
+
+import hashlib
+import json
+
+import numpy as np
+from flask import Response, jsonify, request
+
+from aggregates import CategoryCounter, StatsCube, ValueHistograms
+from config import SUBJECT_CATEGORIES, RELIEF_CATEGORIES
+from routes import filter_args
+
+
+# Record fields clients may request with ?fields=
+API_FIELDS = ['id', 'congress', 'volume', 'chapter', 'privateLawNumber', 'granuleId', 'title', 'date', 'year',
+              'subject_category', 'relief_category', 'summary', 'pdf_link', 'details_link', 'textLink']
+
+# Part of every ETag; bump when any response body changes shape (fields, value formats, error text)
+API_VERSION = 1
+
+# Page size bounds for /api/laws
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+
+def api_error(status, message):
+    """JSON error response."""
+    return jsonify({'error': message}), status
+
+
+def _int_arg(args, name, default, lo, hi):
+    """Integer query parameter clamped to [lo, hi]; ValueError if not an integer."""
+    value = args.get(name)
+    if value in (None, ''):
+        return default
+    try:
+        return min(max(int(value), lo), hi)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer")
+
+
+def _range_arg(args, name):
+    """Inclusive (lo, hi) from a "N" or "N-M" query parameter, or None; ValueError if malformed."""
+    value = args.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        lo, _, hi = value.partition('-')
+        return int(lo), int(hi or lo)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer or a range like 93-97")
+
+
+def register_api(server, df, engine):
+    """Register the /api routes with the Flask server."""
+    
+    dataset_version = df.attrs.get('fingerprint', f"sample-{len(df)}")
+    fields_available = [field for field in API_FIELDS if field in df.columns]
+    histograms = ValueHistograms({'year': df['year'].to_numpy(), 'congress': df['congress'].to_numpy()})
+    category_counters = {
+        'subject': CategoryCounter(df['subject_mask'].to_numpy(), SUBJECT_CATEGORIES),
+        'relief': CategoryCounter(df['relief_mask'].to_numpy(), RELIEF_CATEGORIES)
+    }
+    stats_cube = StatsCube(df['year'].to_numpy(), df['congress'].to_numpy(), df['subject_mask'].to_numpy(),
+                           df['relief_mask'].to_numpy(), SUBJECT_CATEGORIES, RELIEF_CATEGORIES)
+
+    def select(args):
+        """Row positions for the UI filters plus optional whole-word terms."""
+        year_range, subject, relief, search = filter_args(args, df)
+        positions = engine.select(year_range, subject, relief, search)
+        if args.get('terms'):
+            positions = engine.search_words(positions, args['terms'])
+        return positions
+
+    def cached_json(compute):
+        """Respond with compute()'s JSON, or 304 when the client already holds this dataset and query.
+        
+        Responses depend only on the API version, the dataset and the query string, so
+        the ETag is derived from those and a matching If-None-Match skips the work entirely.
+        """
+        query = json.dumps(sorted(request.args.items(multi=True)))
+        etag = hashlib.sha256(f"{API_VERSION}|{dataset_version}|{request.path}|{query}".encode('utf-8')).hexdigest()[:32]
+        # Weak comparison: compressed responses carry the same tag marked weak
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+        else:
+            try:
+                payload = compute()
+            except ValueError as e:
+                return api_error(400, str(e))
+            response = Response(json.dumps(payload), mimetype='application/json')
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        # 200s for this ETag vary by encoding once compressed, so the 304 must say so too
+        response.vary.add('Accept-Encoding')
+        return response
+
+    @server.route('/api/laws')
+    def api_laws():
+        """Laws matching the filters, in dataset order, one page per request.
+        
+        next_cursor is the row position of the last law returned; passing it back
+        as ?cursor= continues after it, stable under any page size.
+        """
+        def compute():
+            positions = select(request.args)
+            limit = _int_arg(request.args, 'limit', DEFAULT_LIMIT, 1, MAX_LIMIT)
+            cursor = _int_arg(request.args, 'cursor', -1, -1, len(df))
+            
+            fields = request.args.get('fields')
+            fields = [f.strip() for f in fields.split(',') if f.strip()] if fields else fields_available
+            unknown = [f for f in fields if f not in fields_available]
+            if unknown:
+                raise ValueError(f"Unknown fields: {', '.join(unknown)} (available: {', '.join(fields_available)})")
+            
+            start = int(np.searchsorted(positions, cursor, side='right'))
+            page = positions[start:start + limit]
+            records = json.loads(engine.rows(page, fields).to_json(orient='records', date_format='iso'))
+            has_more = start + limit < len(positions)
+            return {
+                'total': len(positions),
+                'count': len(records),
+                'next_cursor': str(int(page[-1])) if has_more else None,
+                'laws': records
+            }
+        
+        return cached_json(compute)
+
+    @server.route('/api/aggregate')
+    def api_aggregate():
+        """Counts of the laws matching the filters, grouped by year, congress, subject or relief."""
+        def compute():
+            group_by = request.args.get('group_by', 'year')
+            positions = select(request.args)
+            
+            if group_by in ('year', 'congress'):
+                values, counts = histograms.counts(positions)[group_by]
+                # congress is stored as float; whole numbers go out as ints
+                keys = [int(value) if float(value).is_integer() else value for value in values.tolist()]
+                groups = [{'key': key, 'count': count} for key, count in zip(keys, counts.tolist())]
+            elif group_by in category_counters:
+                counts = category_counters[group_by].counts(positions)
+                groups = [{'key': category, 'count': count} for category, count in counts.items()]
+            else:
+                raise ValueError("group_by must be one of year, congress, subject, relief")
+            
+            return {'total': len(positions), 'group_by': group_by, 'groups': groups}
+        
+        return cached_json(compute)
+
+    @server.route('/api/stats')
+    def api_stats():
+        """Law counts for any mix of year range, congress, subject and relief, grouped by any of those.
+        
+        Answered from the cube built at startup without touching rows, so free-text
+        search is not supported here; use /api/aggregate for that.
+        """
+        def compute():
+            args = request.args
+            year_range, subject, relief, search = filter_args(args, df)
+            if search or args.get('terms'):
+                raise ValueError("/api/stats does not support search; use /api/aggregate")
+            group_by = [g.strip() for g in args.get('group_by', '').split(',') if g.strip()]
+            unknown = [g for g in group_by if g not in StatsCube.GROUPS]
+            if unknown or len(set(group_by)) != len(group_by):
+                raise ValueError(f"group_by must be distinct values from {', '.join(StatsCube.GROUPS)}")
+            for name, value, categories in (('subject', subject, SUBJECT_CATEGORIES), ('relief', relief, RELIEF_CATEGORIES)):
+                if value and value not in categories:
+                    raise ValueError(f"Unknown {name}: {value}")
+            
+            total, groups = stats_cube.counts(
+                year_range=year_range,
+                congress_range=_range_arg(args, 'congress'),
+                subject=subject,
+                relief=relief,
+                group_by=group_by
+            )
+            records = []
+            for keys, count in groups:
+                record = dict(zip(group_by, keys))
+                # congress is stored as float; whole numbers go out as ints, missing as null
+                if 'congress' in record:
+                    congress = record['congress']
+                    record['congress'] = None if congress != congress else int(congress) if congress.is_integer() else congress
+                record['count'] = count
+                records.append(record)
+            return {'total': total, 'group_by': group_by, 'groups': records}
+        
+        return cached_json(compute)
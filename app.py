@@ -11,7 +11,19 @@ import dash
 from styles import CUSTOM_CSS
 from layout import create_layout
 from callbacks import register_callbacks
+from routes import register_routes, register_metrics
+from api import register_api
 from data_loader import load_data_from_csv, generate_sample_data
+from filter_engine import FilterEngine
+from response_cache import ResponseCache
+from shared_cache import SharedCache
+from export_jobs import ExportJobs
+from response_headers import ResponseCompressor, register_response_headers
+from config import (
+    RESPONSE_CACHE_ENTRIES, RESPONSE_CACHE_BYTES, SHARED_CACHE_FILE, SHARED_CACHE_BYTES,
+    EXPORT_DIR, EXPORT_WORKERS, EXPORT_CACHE_BYTES, COMPRESS_MIN_BYTES, COMPRESS_MIMETYPES, GZIP_LEVEL,
+    BROTLI_QUALITY, STATIC_MAX_AGE, METRICS_ENABLED
+)
 
 
 # CONFIGURATION this FIRST
@@ -49,10 +61,44 @@ app.index_string = CUSTOM_CSS
 # The layout
 app.layout = create_layout()
 
-register_callbacks(app, df)
+# Shared row selection used by every callback
+engine = FilterEngine(df)
+
+# Results computed by any worker process, kept across restarts
+shared_cache = SharedCache(SHARED_CACHE_FILE, SHARED_CACHE_BYTES)
+
+# Serialized chart outputs and table pages for repeated filter states (see chart_cache.stats())
+chart_cache = ResponseCache(RESPONSE_CACHE_ENTRIES, RESPONSE_CACHE_BYTES, shared=shared_cache, namespace='charts')
+table_cache = ResponseCache(RESPONSE_CACHE_ENTRIES, RESPONSE_CACHE_BYTES, shared=shared_cache, namespace='table')
+
+# Export files written in the background, shared by all workers through EXPORT_DIR
+export_jobs = ExportJobs(engine, EXPORT_DIR, df.attrs.get('fingerprint', f"sample-{len(df)}"),
+                         max_workers=EXPORT_WORKERS, max_bytes=EXPORT_CACHE_BYTES)
+
+register_callbacks(app, df, engine, chart_cache, table_cache, export_jobs)
 
 server = app.server
 
+# Streaming exports, export downloads and other plain HTTP endpoints
+register_routes(server, df, engine, export_jobs)
+
+# Read-only JSON API over the same filter engine
+register_api(server, df, engine)
+
+# gzip/Brotli for callback JSON and the index page, immutable caching for versioned assets (see compressor.stats())
+compressor = ResponseCompressor(COMPRESS_MIN_BYTES, COMPRESS_MIMETYPES, GZIP_LEVEL, BROTLI_QUALITY)
+register_response_headers(server, compressor, STATIC_MAX_AGE)
+
+# Per-worker counters for tuning cache sizes and compression thresholds
+if METRICS_ENABLED:
+    register_metrics(server, {
+        'filter_engine': engine,
+        'chart_cache': chart_cache,
+        'table_cache': table_cache,
+        'shared_cache': shared_cache,
+        'compression': compressor
+    })
+
 # =============================================================================
 # RUN SERVER
 # =============================================================================
@@ -0,0 +1,50 @@
+"""
+Benchmark: export throughput per format
+---------------------------------------
+Streams the full dataset through every registered export format the way the
+/export route does (FilterEngine selection, EXPORT_CHUNK_ROWS-row chunks) and
+reports rows/s, output MB/s and file size. Uses Private_Laws_Data.csv when it
+is present, otherwise generated sample data. Parquet and Feather only appear
+when pyarrow is installed.
+
+Run from the repository root:  python benchmarks/bench_exports.py
+"""
+
+import contextlib
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from data_loader import load_data_from_csv, generate_sample_data
+from exporters import EXPORT_COLUMNS, EXPORT_FORMATS, EXPORT_CHUNK_ROWS, arrow_schema, iter_frames
+from filter_engine import FilterEngine
+
+
+DATA_FILE = os.path.join(ROOT, 'Private_Laws_Data.csv')
+
+
+def main():
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = load_data_from_csv(DATA_FILE) if os.path.exists(DATA_FILE) else generate_sample_data(45000)
+        engine = FilterEngine(df)
+    
+    columns = [c for c in EXPORT_COLUMNS if c in df.columns]
+    schema = arrow_schema(df[columns])
+    positions = engine.select([int(df['year'].min()), int(df['year'].max())])
+    
+    print(f"{len(positions):,} rows, {EXPORT_CHUNK_ROWS:,}-row chunks")
+    print(f"  {'format':<12} {'seconds':>8} {'rows/s':>10} {'MB/s':>8} {'size MB':>8}")
+    for extension, export_format in EXPORT_FORMATS.items():
+        start = time.perf_counter()
+        size = sum(len(chunk) for chunk in export_format['write'](iter_frames(engine, positions, columns), schema))
+        elapsed = time.perf_counter() - start
+        print(f"  {extension:<12} {elapsed:8.3f} {len(positions) / elapsed:10,.0f} "
+              f"{size / elapsed / 1e6:8.1f} {size / 1e6:8.1f}")
+
+
+if __name__ == '__main__':
+    main()
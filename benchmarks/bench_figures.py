@@ -0,0 +1,92 @@
+"""
+Benchmark: breakdown chart updates, graph_objects figures vs. template + dash.Patch
+-----------------------------------------------------------------------------------
+Times what a breakdown chart callback sends for the same data two ways: a full
+plotly graph_objects figure, validated and serialized on every update (as the
+callbacks used to do), and the dash.Patch the callbacks send now against the
+figure.py template the layout renders once. (The timeline is drawn clientside
+from a Store and sends no figure from the server.) Also checks that applying the
+patch to the template gives the same figure JSON as the graph_objects path,
+and times building the template through graph_objects vs. reusing it.
+
+Run from the repository root:  python benchmarks/bench_figures.py
+"""
+
+import copy
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plotly.io.json import to_json_plotly
+
+from callbacks import breakdown_series
+from config import SUBJECT_CATEGORIES
+from data_loader import generate_sample_data, count_categories
+from figures import _breakdown_go_figure, breakdown_figure, breakdown_patch
+
+
+N_CALLS = 500
+
+
+def go_breakdown(series):
+    """Breakdown built through graph_objects, validating every property."""
+    fig = _breakdown_go_figure()
+    fig.update_traces(
+        y=series['labels'], x=series['percentages'], marker_color=series['colors'],
+        text=series['text'], customdata=series['categories']
+    )
+    fig.update_layout(xaxis_range=series['range'])
+    return fig
+
+
+def apply_patch(figure, patch):
+    """Copy of a figure dict with a Patch's Assign operations applied, as the browser does."""
+    figure = copy.deepcopy(figure)
+    for operation in patch.to_plotly_json()['operations']:
+        *path, last = operation['location']
+        target = figure
+        for part in path:
+            target = target[part]
+        target[last] = operation['params']['value']
+    return figure
+
+
+def time_per_call(build, *args):
+    """Mean seconds to build and serialize one output."""
+    start = time.perf_counter()
+    for _ in range(N_CALLS):
+        to_json_plotly(build(*args))
+    return (time.perf_counter() - start) / N_CALLS
+
+
+def main():
+    df = generate_sample_data(45000)
+    
+    subject_counts = count_categories(df, 'subject_category', SUBJECT_CATEGORIES)
+    subject = breakdown_series(sorted(subject_counts.items(), key=lambda x: x[1], reverse=True), None)
+    
+    cases = [
+        ("subject breakdown", subject, go_breakdown, breakdown_figure, breakdown_patch, _breakdown_go_figure),
+    ]
+    
+    for label, series, go_build, template, patch_build, go_template in cases:
+        patched = apply_patch(template(), patch_build(series))
+        same = json.loads(to_json_plotly(go_build(series))) == json.loads(to_json_plotly(patched))
+        go_time = time_per_call(go_build, series)
+        patch_time = time_per_call(patch_build, series)
+        go_template_time = time_per_call(lambda: go_template().to_plotly_json())
+        template_time = time_per_call(template)
+        
+        print(f"{label} ({N_CALLS} calls, build + serialize)")
+        print(f"  update, graph_objects:    {go_time * 1e3:8.3f} ms/call")
+        print(f"  update, dash.Patch:       {patch_time * 1e3:8.3f} ms/call  ({go_time / patch_time:.0f}x)"
+              f"{'' if same else '  (PATCHED TEMPLATE DIFFERS)'}")
+        print(f"  template, graph_objects:  {go_template_time * 1e3:8.3f} ms/call")
+        print(f"  template, cached dict:    {template_time * 1e3:8.3f} ms/call")
+
+
+if __name__ == '__main__':
+    main()
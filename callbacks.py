@@ -2,9 +2,10 @@
 Callback functions for Private Laws Dashboard
 """
 
+import json
+
 import dash
-from dash import dcc, html, callback, Input, Output, State, ctx
-import plotly.graph_objects as go
+from dash import dcc, html, callback, clientside_callback, Input, Output, State, ctx
 import pandas as pd
 
 from styles import (
@@ -12,433 +13,352 @@ from styles import (
     button_hidden_style, button_visible_style
 )
 from config import SUBJECT_CATEGORIES, RELIEF_CATEGORIES
-from data_loader import truncate_label, count_categories, get_ordinal_suffix
+from data_loader import truncate_label, get_ordinal_suffix
+from aggregates import YearCategoryCube, ValueHistograms
+from figures import TIMELINE_VIEWS, breakdown_patch
+
+
+# Row fields sent to laws-table (display columns are precomputed at load)
+TABLE_COLUMNS = ['id', 'congress', 'volume', 'chapter', 'title', 'date_str', 'subject_short', 'view_btn']
+
+# Part of every chart cache key; bump when the cached chart outputs change shape
+CHART_OUTPUTS_VERSION = 4
+
+# Part of every table page cache key; bump when TABLE_COLUMNS, the display columns or the page tuple change
+TABLE_OUTPUTS_VERSION = 1
+
+
+def breakdown_series(sorted_counts, selected):
+    """Bar data for a category breakdown chart from (category, count) pairs sorted by count."""
+    categories = [item[0] for item in sorted_counts]
+    counts = [item[1] for item in sorted_counts]
+    total_assignments = sum(counts)
+    percentages = [(c / total_assignments * 100) if total_assignments > 0 else 0 for c in counts]
+    
+    bar_colors = []
+    for cat in categories:
+        if selected:
+            if cat == selected:
+                bar_colors.append(COLORS['filter_orange'])
+            else:
+                bar_colors.append(COLORS['bar_muted'])
+        else:
+            bar_colors.append(COLORS['bar_default'])
+    
+    # Reversed so the largest category is drawn at the top
+    return {
+        'labels': [truncate_label(cat, 20) for cat in categories][::-1],
+        'percentages': percentages[::-1],
+        'colors': bar_colors[::-1],
+        'text': [f'{p:.1f}%' for p in percentages[::-1]],
+        'categories': categories[::-1],
+        'range': [0, max(percentages) * 1.3] if percentages else [0, 100]
+    }
+
+
+def selection_toggle_js(chart_id, reset_id, checkbox_type):
+    """Clientside callback toggling a category filter from its breakdown chart, checkboxes and reset button."""
+    return """
+    function(clickData, resetClicks, checkboxValues, currentSelection) {
+        const hidden = %(hidden)s;
+        const visible = %(visible)s;
+        const triggered = dash_clientside.callback_context.triggered_id;
+        
+        // Reset button clicked
+        if (triggered === %(reset_id)s) {
+            return [null, hidden];
+        }
+        
+        // Chart clicked
+        if (triggered === %(chart_id)s && clickData) {
+            const point = clickData.points[0];
+            const clicked = 'customdata' in point ? point.customdata : point.y;
+            return clicked === currentSelection ? [null, hidden] : [clicked, visible];
+        }
+        
+        // Checkbox clicked
+        if (triggered && typeof triggered === 'object' && triggered.type === %(checkbox_type)s) {
+            const clicked = triggered.index;
+            for (const val of checkboxValues) {
+                if (val && val.includes(clicked)) {
+                    return clicked === currentSelection ? [null, hidden] : [clicked, visible];
+                }
+            }
+            if (clicked === currentSelection) {
+                return [null, hidden];
+            }
+        }
+        
+        return [currentSelection, currentSelection ? visible : hidden];
+    }
+    """ % {
+        'hidden': json.dumps(button_hidden_style()),
+        'visible': json.dumps(button_visible_style()),
+        'reset_id': json.dumps(reset_id),
+        'chart_id': json.dumps(chart_id),
+        'checkbox_type': json.dumps(checkbox_type)
+    }
 
 
-def register_callbacks(app, df):
+def category_counts_table(sorted_counts, selected, checkbox_type):
+    """Counts table with a filter checkbox per category, highlighting the selected one."""
+    table_rows = []
+    for cat, cnt in sorted_counts:
+        is_selected = cat == selected
+        row_bg = COLORS['filter_orange_subtle'] if is_selected else 'transparent'
+        text_color = COLORS['filter_orange'] if is_selected else COLORS['text_secondary']
+        
+        table_rows.append(
+            html.Tr([
+                html.Td(
+                    dcc.Checklist(
+                        options=[{'label': '', 'value': cat}],
+                        value=[cat] if is_selected else [],
+                        id={'type': checkbox_type, 'index': cat},
+                        style={'margin': '0'}
+                    ),
+                    style={'padding': '4px 6px', 'width': '30px', 'textAlign': 'center'}
+                ),
+                html.Td(
+                    truncate_label(cat, 22),
+                    title=cat,
+                    style={
+                        'color': text_color,
+                        'padding': '4px 6px',
+                        'fontSize': '11px',
+                        'cursor': 'pointer'
+                    }
+                ),
+                html.Td(
+                    f"{cnt:,}",
+                    style={
+                        'color': COLORS['accent_primary'],
+                        'textAlign': 'right',
+                        'padding': '4px 6px',
+                        'fontSize': '11px',
+                        'fontWeight': '600'
+                    }
+                )
+            ], style={'backgroundColor': row_bg, 'borderBottom': f"1px solid {COLORS['divider']}"})
+        )
+    
+    return html.Table([
+        html.Thead(html.Tr([
+            html.Th("", style={
+                'width': '30px',
+                'padding': '6px',
+                'backgroundColor': COLORS['bg_dark'],
+                'borderBottom': f"1px solid {COLORS['border']}"
+            }),
+            html.Th("Category", style={
+                'textAlign': 'left',
+                'color': COLORS['text_primary'],
+                'backgroundColor': COLORS['bg_dark'],
+                'padding': '6px',
+                'fontSize': '10px',
+                'fontWeight': '600',
+                'textTransform': 'uppercase',
+                'borderBottom': f"1px solid {COLORS['border']}"
+            }),
+            html.Th("Laws", style={
+                'textAlign': 'right',
+                'color': COLORS['text_primary'],
+                'backgroundColor': COLORS['bg_dark'],
+                'padding': '6px',
+                'fontSize': '10px',
+                'fontWeight': '600',
+                'textTransform': 'uppercase',
+                'borderBottom': f"1px solid {COLORS['border']}"
+            })
+        ])),
+        html.Tbody(table_rows)
+    ], style={'width': '100%', 'borderCollapse': 'collapse', 'fontSize': '11px'})
+
+
+def register_callbacks(app, df, engine, chart_cache, table_cache, export_jobs):
     """Register all callbacks with the app instance."""
     
-    @callback(
+    # Cached responses are only valid for the dataset they were computed from
+    dataset_version = df.attrs.get('fingerprint', f"sample-{len(df)}")
+    
+    subject_cube = YearCategoryCube(df['year'].to_numpy(), df['subject_mask'].to_numpy(), SUBJECT_CATEGORIES)
+    relief_cube = YearCategoryCube(df['year'].to_numpy(), df['relief_mask'].to_numpy(), RELIEF_CATEGORIES)
+    
+    # Unfiltered histograms are computed here, once
+    timelines = ValueHistograms({view: df[view].to_numpy() for view in TIMELINE_VIEWS})
+    
+    # Pure UI state transitions run in the browser, so they never wait on a worker
+    clientside_callback(
+        """
+        function(yearRange) {
+            const [start, end] = yearRange;
+            return [String(start), String(end), yearRange, `Breakdown (${start} - ${end})`];
+        }
+        """,
         Output('year-from-display', 'children'),
         Output('year-to-display', 'children'),
         Output('current-year-range', 'data'),
         Output('breakdown-header', 'children'),
         Input('year-range-slider', 'value')
     )
-    def update_year_display(year_range):
-        """Update year display and store current range."""
-        start, end = year_range
-        breakdown_header = f"Breakdown ({start} - {end})"
-        return str(start), str(end), year_range, breakdown_header
 
-    @callback(
-        Output('timeline-chart', 'figure'),
-        Output('total-laws-count', 'children'),
-        Output('subject-breakdown-chart', 'figure'),
-        Output('subject-counts-table', 'children'),
-        Output('relief-section-content', 'children'),
-        Input('year-range-slider', 'value'),
-        Input('timeline-view-toggle', 'value'),
-        Input('selected-subject-category', 'data'),
-        Input('selected-relief-category', 'data')
-    )
-    def update_all_charts(year_range, view_type, selected_subject, selected_relief):
-        """Update all charts based on filters."""
-        start_year, end_year = year_range
-        
-        # Filter by year range
-        filtered_df = df[(df['year'] >= start_year) & (df['year'] <= end_year)]
-        
-        # Apply category filters if active
-        if selected_subject:
-            filtered_df = filtered_df[filtered_df['subject_category'].str.contains(selected_subject, na=False, regex=False)]
-        if selected_relief:
-            filtered_df = filtered_df[filtered_df['relief_category'].str.contains(selected_relief, na=False, regex=False)]
-        
-        total_count = len(filtered_df)
+    def build_timeline(year_range, selected_subject, selected_relief):
+        """Year and congress timeline counts and the total count for the given filters."""
+        positions = engine.select(year_range, selected_subject, selected_relief)
+        total_count = len(positions)
         
         # Determine timeline bar color based on filter state
         timeline_bar_color = COLORS['filter_orange'] if (selected_subject or selected_relief) else COLORS['bar_default']
         
-        # -------------TIMELINE CHART-------------
-        if view_type == 'year':
-            timeline_data = filtered_df.groupby('year').size().reset_index(name='count')
-            x_data = timeline_data['year']
-            x_title = 'Year'
-            hover_template = 'Year: %{x}<br>Laws: %{y:,}<extra></extra>'
-        else:
-            timeline_data = filtered_df.groupby('congress').size().reset_index(name='count')
-            x_data = timeline_data['congress']
-            x_title = 'Congress'
-            hover_template = 'Congress: %{x}<br>Laws: %{y:,}<extra></extra>'
-        
-        timeline_fig = go.Figure(data=[
-            go.Bar(
-                x=x_data,
-                y=timeline_data['count'],
-                marker_color=timeline_bar_color,
-                hovertemplate=hover_template
-            )
-        ])
-        
-        timeline_fig.update_layout(
-            plot_bgcolor=COLORS['bg_card'],
-            paper_bgcolor=COLORS['bg_card'],
-            font_color=COLORS['text_primary'],
-            margin=dict(l=50, r=20, t=10, b=40),
-            xaxis=dict(
-                gridcolor=COLORS['border'],
-                showgrid=False,
-                title=x_title,
-                title_font=dict(size=11, color=COLORS['text_secondary'])
-            ),
-            yaxis=dict(
-                gridcolor=COLORS['border'],
-                showgrid=True,
-                title='Private Laws',
-                title_font=dict(size=11, color=COLORS['text_secondary'])
-            ),
-            hoverlabel=dict(bgcolor=COLORS['bg_elevated'], font_color=COLORS['text_primary']),
-            bargap=0.15
-        )
-        
-        # -------------SUBJECT BREAKDOWN-------------
-        year_filtered_df = df[(df['year'] >= start_year) & (df['year'] <= end_year)]
-        subject_counts = count_categories(year_filtered_df, 'subject_category', SUBJECT_CATEGORIES)
+        # Both views in one pass, so the view toggle can switch between them in the browser
+        histograms = timelines.counts(None if total_count == len(df) else positions)
+        timeline_series = {
+            view: {'x': histograms[view][0].tolist(), 'y': histograms[view][1].tolist()}
+            for view in TIMELINE_VIEWS
+        }
+        timeline_series['color'] = timeline_bar_color
         
+        return timeline_series, f"{total_count:,}"
+    
+    def build_subject_breakdown(year_range, selected_subject):
+        """Subject breakdown series and counts table for the year range."""
+        start_year, end_year = year_range
+        subject_counts = subject_cube.counts(start_year, end_year)
         sorted_subjects = sorted(subject_counts.items(), key=lambda x: x[1], reverse=True)
-        categories = [item[0] for item in sorted_subjects]
-        counts = [item[1] for item in sorted_subjects]
-        total_assignments = sum(counts)
-        percentages = [(c / total_assignments * 100) if total_assignments > 0 else 0 for c in counts]
-        
-        # Truncated labels for chart
-        truncated_cats = [truncate_label(cat, 20) for cat in categories]
+        return (breakdown_series(sorted_subjects, selected_subject),
+                category_counts_table(sorted_subjects, selected_subject, 'subject-checkbox'))
+
+    def build_relief_breakdown(year_range, selected_relief):
+        """Relief breakdown series, counts table and section visibility for the year range."""
+        start_year, end_year = year_range
+        relief_counts = relief_cube.counts(start_year, end_year)
+        has_relief_data = sum(relief_counts.values()) > 0
         
-        bar_colors = []
-        for cat in categories:
-            if selected_subject:
-                if cat == selected_subject:
-                    bar_colors.append(COLORS['filter_orange'])
-                else:
-                    bar_colors.append(COLORS['bar_muted'])
-            else:
-                bar_colors.append(COLORS['bar_default'])
+        sorted_relief = sorted(relief_counts.items(), key=lambda x: x[1], reverse=True)
+        relief_series = breakdown_series(sorted_relief, selected_relief)
+        relief_table = category_counts_table(sorted_relief, selected_relief, 'relief-checkbox') if has_relief_data else None
         
-        subject_fig = go.Figure(data=[
-            go.Bar(
-                y=truncated_cats[::-1],
-                x=percentages[::-1],
-                orientation='h',
-                marker_color=bar_colors[::-1],
-                text=[f'{p:.1f}%' for p in percentages[::-1]],
-                textposition='outside',
-                textfont=dict(size=9, color=COLORS['text_secondary']),
-                hovertemplate='%{customdata}<br>%{x:.1f}%<extra></extra>',
-                customdata=categories[::-1]
-            )
-        ])
+        # The relief chart lives in the layout; without data its placeholder is shown instead
+        relief_chart_style = {'display': 'flex'} if has_relief_data else {'display': 'none'}
+        relief_placeholder_style = {'display': 'none'} if has_relief_data else {'display': 'block'}
         
-        subject_fig.update_layout(
-            plot_bgcolor=COLORS['bg_card'],
-            paper_bgcolor=COLORS['bg_card'],
-            font_color=COLORS['text_primary'],
-            margin=dict(l=120, r=45, t=5, b=5),
-            xaxis=dict(
-                showgrid=False,
-                showticklabels=False,
-                range=[0, max(percentages) * 1.3] if percentages else [0, 100]
-            ),
-            yaxis=dict(
-                showgrid=False,
-                tickfont=dict(size=9, color=COLORS['text_secondary'])
-            ),
-            hoverlabel=dict(bgcolor=COLORS['bg_elevated'], font_color=COLORS['text_primary']),
-            bargap=0.25
+        return relief_series, relief_table, relief_chart_style, relief_placeholder_style
+    
+    # Each chart callback listens only to the inputs it depends on. The figures are
+    # styled once in the layout, so only bar arrays, colors and axis settings are sent.
+
+    @callback(
+        Output('timeline-series', 'data'),
+        Output('total-laws-count', 'children'),
+        Input('year-range-slider', 'value'),
+        Input('selected-subject-category', 'data'),
+        Input('selected-relief-category', 'data')
+    )
+    def update_timeline(year_range, selected_subject, selected_relief):
+        """Send both timeline views for the filters, reusing cached outputs for repeated states."""
+        key = ('timeline', tuple(year_range), selected_subject, selected_relief, dataset_version, CHART_OUTPUTS_VERSION)
+        return chart_cache.get_or_compute(key, lambda: build_timeline(year_range, selected_subject, selected_relief))
+
+    # Draws the toggled view from the stored series without a server call
+    clientside_callback(
+        """
+        function(series, viewType, figure) {
+            if (!series) {
+                return dash_clientside.no_update;
+            }
+            const views = %s;
+            const key = viewType === 'year' ? 'year' : 'congress';
+            const trace = figure.data[0];
+            const layout = figure.layout;
+            return {
+                ...figure,
+                data: [{
+                    ...trace,
+                    x: series[key].x,
+                    y: series[key].y,
+                    marker: {...trace.marker, color: series.color},
+                    hovertemplate: views[key].hovertemplate
+                }],
+                layout: {
+                    ...layout,
+                    xaxis: {...layout.xaxis, title: {...layout.xaxis.title, text: views[key].x_title}}
+                }
+            };
+        }
+        """ % json.dumps(TIMELINE_VIEWS),
+        Output('timeline-chart', 'figure'),
+        Input('timeline-series', 'data'),
+        Input('timeline-view-toggle', 'value'),
+        State('timeline-chart', 'figure')
+    )
+
+    @callback(
+        Output('subject-breakdown-chart', 'figure'),
+        Output('subject-counts-table', 'children'),
+        Input('year-range-slider', 'value'),
+        Input('selected-subject-category', 'data')
+    )
+    def update_subject_breakdown(year_range, selected_subject):
+        """Patch the subject breakdown for the year range and highlighted subject."""
+        key = ('subject', tuple(year_range), selected_subject, dataset_version, CHART_OUTPUTS_VERSION)
+        subject_series, subject_table = chart_cache.get_or_compute(
+            key, lambda: build_subject_breakdown(year_range, selected_subject)
         )
-        
-        # Subject counts table with checkboxes
-        table_rows = []
-        for cat, cnt in sorted_subjects:
-            is_selected = cat == selected_subject
-            row_bg = COLORS['filter_orange_subtle'] if is_selected else 'transparent'
-            text_color = COLORS['filter_orange'] if is_selected else COLORS['text_secondary']
-            
-            table_rows.append(
-                html.Tr([
-                    html.Td(
-                        dcc.Checklist(
-                            options=[{'label': '', 'value': cat}],
-                            value=[cat] if is_selected else [],
-                            id={'type': 'subject-checkbox', 'index': cat},
-                            style={'margin': '0'}
-                        ),
-                        style={'padding': '4px 6px', 'width': '30px', 'textAlign': 'center'}
-                    ),
-                    html.Td(
-                        truncate_label(cat, 22),
-                        title=cat,
-                        style={
-                            'color': text_color,
-                            'padding': '4px 6px',
-                            'fontSize': '11px',
-                            'cursor': 'pointer'
-                        }
-                    ),
-                    html.Td(
-                        f"{cnt:,}",
-                        style={
-                            'color': COLORS['accent_primary'],
-                            'textAlign': 'right',
-                            'padding': '4px 6px',
-                            'fontSize': '11px',
-                            'fontWeight': '600'
-                        }
-                    )
-                ], style={'backgroundColor': row_bg, 'borderBottom': f"1px solid {COLORS['divider']}"})
-            )
-        
-        subject_table = html.Table([
-            html.Thead(html.Tr([
-                html.Th("", style={
-                    'width': '30px',
-                    'padding': '6px',
-                    'backgroundColor': COLORS['bg_dark'],
-                    'borderBottom': f"1px solid {COLORS['border']}"
-                }),
-                html.Th("Category", style={
-                    'textAlign': 'left',
-                    'color': COLORS['text_primary'],
-                    'backgroundColor': COLORS['bg_dark'],
-                    'padding': '6px',
-                    'fontSize': '10px',
-                    'fontWeight': '600',
-                    'textTransform': 'uppercase',
-                    'borderBottom': f"1px solid {COLORS['border']}"
-                }),
-                html.Th("Laws", style={
-                    'textAlign': 'right',
-                    'color': COLORS['text_primary'],
-                    'backgroundColor': COLORS['bg_dark'],
-                    'padding': '6px',
-                    'fontSize': '10px',
-                    'fontWeight': '600',
-                    'textTransform': 'uppercase',
-                    'borderBottom': f"1px solid {COLORS['border']}"
-                })
-            ])),
-            html.Tbody(table_rows)
-        ], style={'width': '100%', 'borderCollapse': 'collapse', 'fontSize': '11px'})
-        
-        # -------------RELIEF BREAKDOWN-------------
-        relief_counts = count_categories(year_filtered_df, 'relief_category', RELIEF_CATEGORIES)
-        has_relief_data = sum(relief_counts.values()) > 0
-        
-        if has_relief_data:
-            sorted_relief = sorted(relief_counts.items(), key=lambda x: x[1], reverse=True)
-            r_categories = [item[0] for item in sorted_relief]
-            r_counts = [item[1] for item in sorted_relief]
-            r_total = sum(r_counts)
-            r_percentages = [(c / r_total * 100) if r_total > 0 else 0 for c in r_counts]
-            
-            r_truncated = [truncate_label(cat, 20) for cat in r_categories]
-            
-            r_bar_colors = []
-            for cat in r_categories:
-                if selected_relief:
-                    if cat == selected_relief:
-                        r_bar_colors.append(COLORS['filter_orange'])
-                    else:
-                        r_bar_colors.append(COLORS['bar_muted'])
-                else:
-                    r_bar_colors.append(COLORS['bar_default'])
-            
-            relief_fig = go.Figure(data=[
-                go.Bar(
-                    y=r_truncated[::-1],
-                    x=r_percentages[::-1],
-                    orientation='h',
-                    marker_color=r_bar_colors[::-1],
-                    text=[f'{p:.1f}%' for p in r_percentages[::-1]],
-                    textposition='outside',
-                    textfont=dict(size=9, color=COLORS['text_secondary']),
-                    hovertemplate='%{customdata}<br>%{x:.1f}%<extra></extra>',
-                    customdata=r_categories[::-1]
-                )
-            ])
-            
-            relief_fig.update_layout(
-                plot_bgcolor=COLORS['bg_card'],
-                paper_bgcolor=COLORS['bg_card'],
-                font_color=COLORS['text_primary'],
-                margin=dict(l=120, r=45, t=5, b=5),
-                height=180,
-                xaxis=dict(showgrid=False, showticklabels=False, range=[0, max(r_percentages) * 1.3] if r_percentages else [0, 100]),
-                yaxis=dict(showgrid=False, tickfont=dict(size=9, color=COLORS['text_secondary'])),
-                hoverlabel=dict(bgcolor=COLORS['bg_elevated'], font_color=COLORS['text_primary']),
-                bargap=0.25
-            )
-            
-            # Relief table
-            r_table_rows = []
-            for cat, cnt in sorted_relief:
-                is_selected = cat == selected_relief
-                row_bg = COLORS['filter_orange_subtle'] if is_selected else 'transparent'
-                text_color = COLORS['filter_orange'] if is_selected else COLORS['text_secondary']
-                
-                r_table_rows.append(
-                    html.Tr([
-                        html.Td(
-                            dcc.Checklist(
-                                options=[{'label': '', 'value': cat}],
-                                value=[cat] if is_selected else [],
-                                id={'type': 'relief-checkbox', 'index': cat},
-                                style={'margin': '0'}
-                            ),
-                            style={'padding': '4px 6px', 'width': '30px', 'textAlign': 'center'}
-                        ),
-                        html.Td(
-                            truncate_label(cat, 22),
-                            title=cat,
-                            style={
-                                'color': text_color,
-                                'padding': '4px 6px',
-                                'fontSize': '11px',
-                                'cursor': 'pointer'
-                            }
-                        ),
-                        html.Td(
-                            f"{cnt:,}",
-                            style={
-                                'color': COLORS['accent_primary'],
-                                'textAlign': 'right',
-                                'padding': '4px 6px',
-                                'fontSize': '11px',
-                                'fontWeight': '600'
-                            }
-                        )
-                    ], style={'backgroundColor': row_bg, 'borderBottom': f"1px solid {COLORS['divider']}"})
-                )
-            
-            relief_table = html.Table([
-                html.Thead(html.Tr([
-                    html.Th("", style={
-                        'width': '30px',
-                        'padding': '6px',
-                        'backgroundColor': COLORS['bg_dark'],
-                        'borderBottom': f"1px solid {COLORS['border']}"
-                    }),
-                    html.Th("Category", style={
-                        'textAlign': 'left',
-                        'color': COLORS['text_primary'],
-                        'backgroundColor': COLORS['bg_dark'],
-                        'padding': '6px',
-                        'fontSize': '10px',
-                        'fontWeight': '600',
-                        'textTransform': 'uppercase',
-                        'borderBottom': f"1px solid {COLORS['border']}"
-                    }),
-                    html.Th("Laws", style={
-                        'textAlign': 'right',
-                        'color': COLORS['text_primary'],
-                        'backgroundColor': COLORS['bg_dark'],
-                        'padding': '6px',
-                        'fontSize': '10px',
-                        'fontWeight': '600',
-                        'textTransform': 'uppercase',
-                        'borderBottom': f"1px solid {COLORS['border']}"
-                    })
-                ])),
-                html.Tbody(r_table_rows)
-            ], style={'width': '100%', 'borderCollapse': 'collapse', 'fontSize': '11px'})
-            
-            relief_content = html.Div([
-                html.Div([
-                    dcc.Graph(
-                        id='relief-breakdown-chart',
-                        figure=relief_fig,
-                        config={'displayModeBar': False},
-                        style={'height': '180px'}
-                    )
-                ], style={'width': '55%', 'display': 'inline-block', 'verticalAlign': 'top'}),
-                html.Div([
-                    html.Div([relief_table], style={
-                        'maxHeight': '180px',
-                        'overflowY': 'auto',
-                        'border': f"1px solid {COLORS['border']}",
-                        'borderRadius': '4px'
-                    })
-                ], style={'width': '45%', 'display': 'inline-block', 'verticalAlign': 'top', 'paddingLeft': '8px'})
-            ], style={'display': 'flex'})
-        else:
-            relief_content = html.Div([
-                html.Div([
-                    html.Span("📊", style={'fontSize': '36px', 'marginBottom': '12px', 'display': 'block'}),
-                    html.P("Relief category data coming soon", style={
-                        'color': COLORS['text_muted'],
-                        'fontSize': '13px',
-                        'margin': '0 0 4px 0'
-                    }),
-                    html.P("This section will populate automatically once data is available.", style={
-                        'color': COLORS['text_muted'],
-                        'fontSize': '11px',
-                        'margin': '0'
-                    })
-                ], style={
-                    'textAlign': 'center',
-                    'padding': '40px 20px',
-                    'backgroundColor': COLORS['bg_dark'],
-                    'borderRadius': '6px',
-                    'border': f"1px dashed {COLORS['border']}"
-                })
-            ])
-        
-        return timeline_fig, f"{total_count:,}", subject_fig, subject_table, relief_content
+        return breakdown_patch(subject_series), subject_table
+
+    @callback(
+        Output('relief-breakdown-chart', 'figure'),
+        Output('relief-counts-table', 'children'),
+        Output('relief-chart-container', 'style'),
+        Output('relief-placeholder', 'style'),
+        Input('year-range-slider', 'value'),
+        Input('selected-relief-category', 'data')
+    )
+    def update_relief_breakdown(year_range, selected_relief):
+        """Patch the relief breakdown for the year range and highlighted relief category."""
+        key = ('relief', tuple(year_range), selected_relief, dataset_version, CHART_OUTPUTS_VERSION)
+        relief_series, relief_table, relief_chart_style, relief_placeholder_style = chart_cache.get_or_compute(
+            key, lambda: build_relief_breakdown(year_range, selected_relief)
+        )
+        return breakdown_patch(relief_series), relief_table, relief_chart_style, relief_placeholder_style
 
     @callback(
         Output('laws-table', 'data'),
         Output('laws-table', 'page_size'),
         Output('laws-table', 'style_data_conditional'),
+        Output('laws-table', 'page_count'),
+        Output('laws-table', 'page_current'),
+        Output('table-row-count', 'children'),
         Input('year-range-slider', 'value'),
         Input('search-input', 'value'),
         Input('selected-subject-category', 'data'),
         Input('selected-relief-category', 'data'),
         Input('page-size-dropdown', 'value'),
-        Input('selected-law-id', 'data')
+        Input('selected-law-id', 'data'),
+        Input('laws-table', 'page_current'),
+        Input('laws-table', 'sort_by')
     )
-    def update_table(year_range, search_value, selected_subject, selected_relief, page_size, selected_law_id):
-        """Update table based on all filters."""
-        start_year, end_year = year_range
-        
-        filtered_df = df[(df['year'] >= start_year) & (df['year'] <= end_year)].copy()
-        
-        if selected_subject:
-            filtered_df = filtered_df[filtered_df['subject_category'].str.contains(selected_subject, na=False, regex=False)]
-        if selected_relief:
-            filtered_df = filtered_df[filtered_df['relief_category'].str.contains(selected_relief, na=False, regex=False)]
-        
-        if search_value:
-            search_lower = search_value.lower()
-            mask = (
-                filtered_df['title'].str.lower().str.contains(search_lower, na=False) |
-                filtered_df['date'].astype(str).str.contains(search_lower, na=False) |
-                filtered_df['subject_category'].str.lower().str.contains(search_lower, na=False) |
-                filtered_df['relief_category'].str.lower().str.contains(search_lower, na=False)
-            )
-            filtered_df = filtered_df[mask]
-        
-        if pd.api.types.is_datetime64_any_dtype(filtered_df['date']):
-            filtered_df['date_str'] = filtered_df['date'].dt.strftime('%Y-%m-%d')
-        else:
-            filtered_df['date_str'] = filtered_df['date'].astype(str)
-        
-        filtered_df['subject_short'] = filtered_df['subject_category'].apply(
-            lambda x: (str(x)[:30] + '...') if len(str(x)) > 30 else str(x)
-        )
-        
-        filtered_df['view_btn'] = '→'
-        
-        table_data = filtered_df[['id', 'congress', 'volume', 'chapter', 'title', 'date_str', 'subject_short', 'view_btn']].to_dict('records')
+    def update_table(year_range, search_value, selected_subject, selected_relief, page_size, selected_law_id,
+                     page_current, sort_by):
+        """Update table based on all filters, sending only the visible page."""
+        # Filter, sort or page size changes go back to the first page; selecting a law keeps it
+        # (page_current and sort_by share the 'laws-table' id, so compare full prop ids)
+        triggered = set(ctx.triggered_prop_ids)
+        if not triggered or not triggered <= {'laws-table.page_current', 'selected-law-id.data'}:
+            page_current = 0
+        
+        def build_page():
+            positions = engine.select_sorted(year_range, selected_subject, selected_relief, search_value, sort_by)
+            page_count = max(-(-len(positions) // page_size), 1)
+            page = min(page_current or 0, page_count - 1)
+            page_positions = positions[page * page_size:(page + 1) * page_size]
+            table_data = engine.rows(page_positions, TABLE_COLUMNS).to_dict('records')
+            return table_data, page_count, page, f"{len(positions):,} laws"
+        
+        sort_key = tuple((item['column_id'], item['direction']) for item in sort_by or [])
+        key = (engine.spec(year_range, selected_subject, selected_relief, search_value), sort_key,
+               page_size, page_current or 0, dataset_version, TABLE_OUTPUTS_VERSION)
+        table_data, page_count, page_current, row_count = table_cache.get_or_compute(key, build_page)
         
         style_conditional = [
             {
@@ -455,19 +375,16 @@ def register_callbacks(app, df):
                 'color': COLORS['text_primary']
             })
         
-        return table_data, page_size, style_conditional
+        return table_data, page_size, style_conditional, page_count, page_current, row_count
 
     @callback(
         Output('selected-law-id', 'data'),
         Output('info-panel-header', 'style'),
         Output('law-info-content', 'children'),
         Input('laws-table', 'active_cell'),
-        State('laws-table', 'data'),
-        State('laws-table', 'page_current'),
-        State('laws-table', 'page_size'),
-        State('laws-table', 'derived_virtual_data')
+        State('laws-table', 'data')
     )
-    def update_law_info(active_cell, table_data, page_current, page_size, virtual_data):
+    def update_law_info(active_cell, table_data):
         """Update info panel when a row is clicked."""
         default_header_style = {
             **section_header_style(),
@@ -493,22 +410,18 @@ def register_callbacks(app, df):
         if not active_cell:
             return None, default_header_style, default_content
         
-        row_on_page = active_cell['row']
-        actual_row_idx = (page_current * page_size) + row_on_page
-        data_source = virtual_data if virtual_data else table_data
+        # The table only holds the current page, whose rows carry their law id
+        law_id = active_cell.get('row_id')
+        if law_id is None:
+            row_on_page = active_cell['row']
+            if not table_data or row_on_page >= len(table_data):
+                return None, default_header_style, default_content
+            law_id = table_data[row_on_page]['id']
         
-        if not data_source or actual_row_idx >= len(data_source):
+        full_record = engine.records.record('id', law_id)
+        if full_record is None:
             return None, default_header_style, default_content
         
-        row_data = data_source[actual_row_idx]
-        law_id = row_data['id']
-        
-        matching_records = df[df['id'] == law_id]
-        if matching_records.empty:
-            return None, default_header_style, default_content
-        
-        full_record = matching_records.iloc[0]
-        
         highlighted_header_style = {
             **section_header_style(),
             'borderBottomColor': COLORS['highlight_row']
@@ -613,7 +526,9 @@ def register_callbacks(app, df):
         
         return law_id, highlighted_header_style, info_content
 
-    @callback(
+    # Chart clicks and checkboxes toggle the category filter; the reset button clears it
+    clientside_callback(
+        selection_toggle_js('subject-breakdown-chart', 'reset-subject-filter-btn', 'subject-checkbox'),
         Output('selected-subject-category', 'data'),
         Output('reset-subject-filter-btn', 'style'),
         Input('subject-breakdown-chart', 'clickData'),
@@ -621,35 +536,9 @@ def register_callbacks(app, df):
         Input({'type': 'subject-checkbox', 'index': dash.ALL}, 'value'),
         State('selected-subject-category', 'data')
     )
-    def handle_subject_selection(click_data, reset_clicks, checkbox_values, current_selection):
-        """Handle clicks on subject breakdown chart or checkboxes."""
-        triggered = ctx.triggered_id
-        
-        # Reset button clicked
-        if triggered == 'reset-subject-filter-btn':
-            return None, button_hidden_style()
-        
-        # Chart clicked
-        if triggered == 'subject-breakdown-chart' and click_data:
-            clicked_category = click_data['points'][0].get('customdata', click_data['points'][0]['y'])
-            if clicked_category == current_selection:
-                return None, button_hidden_style()
-            return clicked_category, button_visible_style()
-        
-        # Checkbox clicked
-        if isinstance(triggered, dict) and triggered.get('type') == 'subject-checkbox':
-            clicked_category = triggered['index']
-            for val in checkbox_values:
-                if val and clicked_category in val:
-                    if clicked_category == current_selection:
-                        return None, button_hidden_style()
-                    return clicked_category, button_visible_style()
-            if clicked_category == current_selection:
-                return None, button_hidden_style()
-        
-        return current_selection, button_visible_style() if current_selection else button_hidden_style()
 
-    @callback(
+    clientside_callback(
+        selection_toggle_js('relief-breakdown-chart', 'reset-relief-filter-btn', 'relief-checkbox'),
         Output('selected-relief-category', 'data'),
         Output('reset-relief-filter-btn', 'style'),
         Input('relief-breakdown-chart', 'clickData'),
@@ -657,69 +546,53 @@ def register_callbacks(app, df):
         Input({'type': 'relief-checkbox', 'index': dash.ALL}, 'value'),
         State('selected-relief-category', 'data')
     )
-    def handle_relief_selection(click_data, reset_clicks, checkbox_values, current_selection):
-        """Handle clicks on relief breakdown chart or checkboxes."""
-        triggered = ctx.triggered_id
-        
-        if triggered == 'reset-relief-filter-btn':
-            return None, button_hidden_style()
-        
-        if triggered == 'relief-breakdown-chart' and click_data:
-            clicked_category = click_data['points'][0].get('customdata', click_data['points'][0]['y'])
-            if clicked_category == current_selection:
-                return None, button_hidden_style()
-            return clicked_category, button_visible_style()
-        
-        if isinstance(triggered, dict) and triggered.get('type') == 'relief-checkbox':
-            clicked_category = triggered['index']
-            for val in checkbox_values:
-                if val and clicked_category in val:
-                    if clicked_category == current_selection:
-                        return None, button_hidden_style()
-                    return clicked_category, button_visible_style()
-            if clicked_category == current_selection:
-                return None, button_hidden_style()
-        
-        return current_selection, button_visible_style() if current_selection else button_hidden_style()
 
-    @callback(
+    clientside_callback(
+        "function(n_clicks) { return ''; }",
         Output('search-input', 'value'),
         Input('reset-search-btn', 'n_clicks'),
         prevent_initial_call=True
     )
-    def reset_search(n_clicks):
-        return ''
 
     @callback(
-        Output('download-csv', 'data'),
+        Output('export-job', 'data'),
         Input('export-btn', 'n_clicks'),
+        State('export-format', 'value'),
         State('year-range-slider', 'value'),
         State('search-input', 'value'),
         State('selected-subject-category', 'data'),
         State('selected-relief-category', 'data'),
         prevent_initial_call=True
     )
-    def export_csv(n_clicks, year_range, search_value, selected_subject, selected_relief):
-        start_year, end_year = year_range
-        
-        filtered_df = df[(df['year'] >= start_year) & (df['year'] <= end_year)].copy()
-        
-        if selected_subject:
-            filtered_df = filtered_df[filtered_df['subject_category'].str.contains(selected_subject, na=False, regex=False)]
-        if selected_relief:
-            filtered_df = filtered_df[filtered_df['relief_category'].str.contains(selected_relief, na=False, regex=False)]
-        
-        if search_value:
-            search_lower = search_value.lower()
-            mask = (
-                filtered_df['title'].str.lower().str.contains(search_lower, na=False) |
-                filtered_df['date'].astype(str).str.contains(search_lower, na=False) |
-                filtered_df['subject_category'].str.lower().str.contains(search_lower, na=False) |
-                filtered_df['relief_category'].str.lower().str.contains(search_lower, na=False)
-            )
-            filtered_df = filtered_df[mask]
-        
-        export_cols = ['congress', 'volume', 'chapter', 'title', 'date', 'year', 'subject_category', 'relief_category', 'summary', 'pdf_link', 'details_link']
-        export_df = filtered_df[[c for c in export_cols if c in filtered_df.columns]]
-        
-        return dcc.send_data_frame(export_df.to_csv, f"private_laws_{start_year}_{end_year}.csv", index=False)
+    def start_export(n_clicks, export_format, year_range, search_value, selected_subject, selected_relief):
+        """Queue a background export of the filtered laws; identical finished exports are reused."""
+        return export_jobs.submit(year_range, selected_subject, selected_relief, search_value, export_format)
+
+    @callback(
+        Output('export-status', 'children'),
+        Output('export-poll', 'disabled'),
+        Input('export-job', 'data'),
+        Input('export-poll', 'n_intervals'),
+        prevent_initial_call=True
+    )
+    def poll_export(job_id, n_intervals):
+        """Show export progress, polling until the file is ready to download."""
+        status = export_jobs.status(job_id) if job_id else None
+        if status is None:
+            return None, True
+        
+        if status['state'] == 'failed':
+            return html.Span("Export failed", style={'color': COLORS['error']}), True
+        
+        if status['state'] == 'queued':
+            return "Waiting for an export worker…", False
+        
+        if status['state'] == 'running':
+            percent = 100 * status['rows_done'] // max(status['rows_total'], 1)
+            return f"Preparing export… {percent}%", False
+        
+        return html.A(
+            f"Download {status['filename']} ({status['size'] / 1e6:.1f} MB)",
+            href=app.get_relative_path(f"/export/files/{job_id}"),
+            style={'color': COLORS['accent_primary']}
+        ), True
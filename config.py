@@ -2,6 +2,8 @@
 Configuration constants for Private Laws Dashboard
 """
 
+import os
+
 
 # CATEGORY DEFINITIONS
 # --------------------------------------------------------------------------------------------------------------------
@@ -52,3 +54,39 @@ RELIEF_CATEGORIES = [
     "Payment of Private Liabilities",
     "Providing Relief from Harm Caused by Natural or non-Natural Disasters"
 ]
+
+
+# CACHING
+# --------------------------------------------------------------------------------------------------------------------
+
+# Directory for load-time snapshots and other derived artifacts (override with PLD_CACHE_DIR)
+CACHE_DIR = os.environ.get('PLD_CACHE_DIR', '.cache')
+
+# In-process cache of chart callback outputs
+RESPONSE_CACHE_ENTRIES = 256
+RESPONSE_CACHE_BYTES = 64 * 1024 * 1024
+
+# Disk cache shared by all worker processes (chart outputs and table pages)
+SHARED_CACHE_FILE = os.path.join(CACHE_DIR, 'shared-cache.sqlite3')
+SHARED_CACHE_BYTES = int(os.environ.get('PLD_SHARED_CACHE_MB', '512')) * 1024 * 1024
+
+# Background export jobs: finished files are kept per filter spec and format up to EXPORT_CACHE_BYTES
+EXPORT_DIR = os.path.join(CACHE_DIR, 'exports')
+EXPORT_WORKERS = 2
+EXPORT_CACHE_BYTES = 2 * 1024 * 1024 * 1024
+
+
+# HTTP RESPONSES
+# --------------------------------------------------------------------------------------------------------------------
+
+# JSON and HTML responses at least this large are gzip- or Brotli-compressed
+COMPRESS_MIN_BYTES = 1024
+COMPRESS_MIMETYPES = ('application/json', 'text/html')
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Versioned static assets (fingerprinted component suites, /assets/ with ?m=) are cached this long
+STATIC_MAX_AGE = 365 * 24 * 60 * 60
+
+# Serve per-worker cache and compression counters at /debug/metrics (set PLD_METRICS=1)
+METRICS_ENABLED = os.environ.get('PLD_METRICS') == '1'
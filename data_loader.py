@@ -2,33 +2,85 @@
 Data loading and utility functions for Private Laws Dashboard
 """
 
+import hashlib
+import json
+import os
+import tempfile
+import time
+
 import pandas as pd
 import numpy as np
-from config import SUBJECT_CATEGORIES, RELIEF_CATEGORIES
+from config import SUBJECT_CATEGORIES, RELIEF_CATEGORIES, CACHE_DIR
+
+
+# Bump whenever the parsed frame changes shape so stale snapshots are rebuilt
+SNAPSHOT_VERSION = 5
+
+# Candidate date formats, tried in order of how many sampled rows they match
+DATE_FORMATS = ['%Y-%m-%d', '%m-%d-%Y', '%m/%d/%Y', '%Y/%m/%d', '%d-%m-%Y', '%d/%m/%Y']
+
+# Bitmask column derived from each category column
+CATEGORY_MASK_COLUMNS = {'subject_category': 'subject_mask', 'relief_category': 'relief_mask'}
+
+# Separator used to pack a string column into a single UTF-8 buffer
+_SNAPSHOT_SEP = '\x00'
+
+
+def load_data_from_csv(filepath, cache_dir=CACHE_DIR):
+    """Load private laws data from CSV file, reusing a columnar snapshot while the CSV is unchanged."""
+    timings = {}
+    
+    phase_start = time.perf_counter()
+    fingerprint = file_fingerprint(filepath)
+    timings['fingerprint'] = time.perf_counter() - phase_start
+    
+    snapshot_path = _snapshot_path(filepath, cache_dir) if cache_dir else None
+    
+    df = None
+    if snapshot_path:
+        phase_start = time.perf_counter()
+        df = read_snapshot(snapshot_path, fingerprint)
+        if df is not None:
+            timings['snapshot read'] = time.perf_counter() - phase_start
+            print(f"✓ Loaded snapshot {snapshot_path}")
+    
+    if df is None:
+        df = _parse_csv(filepath, timings)
+        if snapshot_path:
+            phase_start = time.perf_counter()
+            if write_snapshot(df, snapshot_path, fingerprint):
+                timings['snapshot write'] = time.perf_counter() - phase_start
+                print(f"✓ Wrote snapshot {snapshot_path}")
+    
+    df.attrs['fingerprint'] = fingerprint
+    
+    print(f"✓ Loaded {len(df):,} records")
+    print(f"✓ Year range: {df['year'].min()} - {df['year'].max()}")
+    print("✓ Load phases: " + ", ".join(f"{name} {secs * 1000:.1f}ms" for name, secs in timings.items()))
+    
+    return df
 
 
-def load_data_from_csv(filepath):
-    """Load private laws data from CSV file with robust date handling."""
+def _parse_csv(filepath, timings):
+    """Parse and clean the raw CSV, recording phase durations in timings."""
+    phase_start = time.perf_counter()
     df = pd.read_csv(filepath)
+    timings['csv read'] = time.perf_counter() - phase_start
     
     if 'id' not in df.columns:
         df['id'] = range(1, len(df) + 1)
     
+    phase_start = time.perf_counter()
     if 'date' in df.columns:
-        for fmt in ['%Y-%m-%d', '%m-%d-%Y', '%m/%d/%Y', '%Y/%m/%d', '%d-%m-%Y', '%d/%m/%Y']:
-            try:
-                df['date'] = pd.to_datetime(df['date'], format=fmt)
-                print(f"✓ Parsed dates with format: {fmt}")
-                break
-            except (ValueError, TypeError):
-                continue
-        else:
-            try:
-                df['date'] = pd.to_datetime(df['date'])
-                print("✓ Parsed dates using pandas auto-detection")
-            except Exception as e:
-                print(f"⚠ Could not parse dates: {e}")
+        df['date'], report = parse_dates(df['date'])
+        for fmt, count in report['formats'].items():
+            print(f"✓ Parsed {count:,} dates with format: {fmt}")
+        if report['fallback']:
+            print(f"⚠ {report['fallback']:,} dates needed per-row parsing, {report['failed']:,} could not be parsed")
     
+    timings['date parse'] = time.perf_counter() - phase_start
+    
+    phase_start = time.perf_counter()
     if 'year' not in df.columns and 'date' in df.columns:
         if pd.api.types.is_datetime64_any_dtype(df['date']):
             df['year'] = df['date'].dt.year
@@ -46,13 +98,230 @@ def load_data_from_csv(filepath):
     for col in ['summary', 'pdf_link', 'details_link']:
         if col not in df.columns:
             df[col] = ''
+    timings['clean'] = time.perf_counter() - phase_start
     
-    print(f"✓ Loaded {len(df):,} records")
-    print(f"✓ Year range: {df['year'].min()} - {df['year'].max()}")
+    phase_start = time.perf_counter()
+    df = sort_by_year(df)
+    add_derived_columns(df)
+    timings['derive'] = time.perf_counter() - phase_start
     
     return df
 
 
+def sort_by_year(df):
+    """Order rows by year then date so any year range is a contiguous block of rows."""
+    keys = ['year', 'date'] if 'date' in df.columns else ['year']
+    return df.sort_values(keys, kind='mergesort').reset_index(drop=True)
+
+
+def add_derived_columns(df):
+    """Add the precomputed columns the callbacks filter and render from."""
+    df['subject_mask'] = encode_categories(df['subject_category'], SUBJECT_CATEGORIES)
+    df['relief_mask'] = encode_categories(df['relief_category'], RELIEF_CATEGORIES)
+    
+    # Display columns for the laws table, so pages are plain row slices
+    if pd.api.types.is_datetime64_any_dtype(df['date']):
+        df['date_str'] = df['date'].dt.strftime('%Y-%m-%d')
+    else:
+        df['date_str'] = df['date'].astype(str)
+    subject = df['subject_category'].astype(str)
+    df['subject_short'] = subject.where(subject.str.len() <= 30, subject.str[:30] + '...')
+    df['view_btn'] = '→'
+    return df
+
+
+def parse_dates(values, formats=DATE_FORMATS, sample_size=1000):
+    """Parse a date column, inferring formats from a sample so each distinct value is parsed once.
+    
+    Values that match none of the formats go through a per-row fallback.
+    Returns the parsed Series and a report of rows parsed per format,
+    rows sent to the fallback and rows that could not be parsed.
+    """
+    report = {'formats': {}, 'fallback': 0, 'failed': 0}
+    
+    # Dates repeat heavily, so parse each distinct string once and broadcast back
+    codes, uniques = pd.factorize(values.to_numpy(dtype=object))
+    rows_per_value = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    text = np.char.strip(np.asarray(uniques, dtype=str)) if len(uniques) else np.array([], dtype=str)
+    parsed = np.full(len(uniques), np.datetime64('NaT'), dtype='datetime64[ns]')
+    remaining = np.arange(len(uniques))
+    
+    if len(uniques):
+        # Rank formats by how many evenly spaced sample values they match; ties keep list order
+        sample = text[::max(len(text) // sample_size, 1)]
+        hits = {fmt: int(pd.to_datetime(sample, format=fmt, errors='coerce').notna().sum()) for fmt in formats}
+        
+        # Each format only sees the values every earlier format failed on
+        for fmt in sorted(formats, key=lambda fmt: -hits[fmt]):
+            result = pd.to_datetime(text[remaining], format=fmt, errors='coerce')
+            ok = np.asarray(result.notna())
+            if ok.any():
+                parsed[remaining[ok]] = result[ok].to_numpy().astype('datetime64[ns]')
+                report['formats'][fmt] = int(rows_per_value[remaining[ok]].sum())
+                remaining = remaining[~ok]
+            if len(remaining) == 0:
+                break
+    
+    report['fallback'] = int(rows_per_value[remaining].sum())
+    for pos in remaining:
+        try:
+            parsed[pos] = pd.Timestamp(text[pos]).to_datetime64()
+        except (ValueError, TypeError, OverflowError):
+            report['failed'] += int(rows_per_value[pos])
+    
+    result = np.where(codes >= 0, parsed[codes], np.datetime64('NaT'))
+    return pd.Series(result, index=values.index, name=values.name), report
+
+
+# SNAPSHOT CACHE
+# ---------------------------------------------------------------------------------------------------------------------------------
+
+def file_fingerprint(filepath, chunk_size=1 << 20):
+    """Fingerprint a file by its size, modification time and content hash."""
+    stat = os.stat(filepath)
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return f"{stat.st_size}-{stat.st_mtime_ns}-{digest.hexdigest()[:16]}"
+
+
+def _snapshot_path(filepath, cache_dir):
+    """Snapshot location for a given source file."""
+    return os.path.join(cache_dir, os.path.basename(filepath) + '.snapshot.npz')
+
+
+def write_snapshot(df, path, fingerprint):
+    """Write df as a typed columnar .npz bundle. Returns False if the frame cannot be snapshotted."""
+    if not isinstance(df.index, pd.RangeIndex) or df.index.start != 0 or df.index.step != 1:
+        return False
+    
+    arrays = {}
+    columns = []
+    for i, name in enumerate(df.columns):
+        encoded = _encode_column(df[name])
+        if encoded is None:
+            print(f"⚠ Snapshot skipped: column {name!r} has an unsupported dtype")
+            return False
+        kind, parts = encoded
+        columns.append({'name': name, 'kind': kind, 'dtype': str(df[name].dtype)})
+        for part, values in parts.items():
+            arrays[f"c{i}_{part}"] = values
+    
+    meta = {'version': SNAPSHOT_VERSION, 'fingerprint': fingerprint, 'rows': len(df), 'columns': columns}
+    arrays['meta'] = np.array(json.dumps(meta))
+    
+    return _write_npz(path, arrays)
+
+
+def _write_npz(path, arrays):
+    """Atomically write a dict of arrays to an .npz file. Returns False on failure."""
+    try:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        # Write then rename so concurrently booting workers never read a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, **arrays)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        print(f"⚠ Could not write {path}: {e}")
+        return False
+    
+    return True
+
+
+def read_snapshot(path, fingerprint):
+    """Read a snapshot written by write_snapshot, or None if it is missing or stale."""
+    if not os.path.exists(path):
+        return None
+    
+    try:
+        with np.load(path, allow_pickle=False) as bundle:
+            meta = json.loads(str(bundle['meta']))
+            if meta.get('version') != SNAPSHOT_VERSION or meta.get('fingerprint') != fingerprint:
+                print("✓ Snapshot is stale, re-parsing CSV")
+                return None
+            data = {
+                col['name']: _decode_column(col, bundle, f"c{i}_", meta['rows'])
+                for i, col in enumerate(meta['columns'])
+            }
+    except (OSError, ValueError, KeyError) as e:
+        print(f"⚠ Could not read snapshot: {e}")
+        return None
+    
+    return pd.DataFrame(data)
+
+
+def _encode_column(series):
+    """Encode a column as (kind, arrays), or None if its dtype is not supported."""
+    dtype = series.dtype
+    
+    if pd.api.types.is_datetime64_dtype(dtype):
+        return 'datetime', {'values': series.to_numpy()}
+    
+    if isinstance(dtype, np.dtype) and dtype.kind in 'biuf':
+        return 'numeric', {'values': series.to_numpy()}
+    
+    if pd.api.types.is_string_dtype(dtype) or dtype == object:
+        mask = series.isna().to_numpy()
+        values = series.to_numpy(dtype=object, na_value='')
+        if not all(isinstance(v, str) for v in values):
+            return None
+        joined = _SNAPSHOT_SEP.join(values)
+        if joined.count(_SNAPSHOT_SEP) != max(len(values) - 1, 0):
+            return None
+        return 'string', {
+            'values': np.frombuffer(joined.encode('utf-8'), dtype=np.uint8),
+            'mask': mask
+        }
+    
+    return None
+
+
+def _decode_column(col, bundle, prefix, n_rows):
+    """Rebuild a pandas Series from its snapshot arrays."""
+    if col['kind'] != 'string':
+        return pd.Series(bundle[prefix + 'values'], dtype=col['dtype'])
+    
+    text = bundle[prefix + 'values'].tobytes().decode('utf-8')
+    values = np.array(text.split(_SNAPSHOT_SEP) if n_rows else [], dtype=object)
+    values[bundle[prefix + 'mask']] = np.nan
+    return pd.Series(values, dtype=col['dtype'])
+
+
+def cached_arrays(name, fingerprint, build, params=None, cache_dir=CACHE_DIR):
+    """Arrays derived from the loaded dataset, calling build() only when no current copy is cached.
+    
+    build must return a dict of NumPy arrays without object dtype. params is any
+    JSON-serializable description of how build derives them (columns, format
+    version); a cached copy is reused only if it matches. Nothing is cached when
+    there is no fingerprint (e.g. generated sample data) or cache_dir.
+    """
+    if not fingerprint or not cache_dir:
+        return build()
+    
+    # Row positions depend on the snapshot layout, so its version is part of the key
+    params_hash = hashlib.sha256(json.dumps([name, params]).encode('utf-8')).hexdigest()[:16]
+    key = f"{SNAPSHOT_VERSION}:{fingerprint}:{params_hash}"
+    path = os.path.join(cache_dir, f"{name}.npz")
+    if os.path.exists(path):
+        try:
+            with np.load(path, allow_pickle=False) as bundle:
+                if str(bundle['key']) == key:
+                    return {part: bundle[part] for part in bundle.files if part != 'key'}
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠ Could not read {path}: {e}")
+    
+    arrays = build()
+    _write_npz(path, {**arrays, 'key': np.array(key)})
+    return arrays
+
+
 def generate_sample_data(n_records=5000):
     """Generate sample data for testing."""
     np.random.seed(42)
@@ -93,7 +362,8 @@ def generate_sample_data(n_records=5000):
         'details_link': [f"https://www.congress.gov/bill/{c}th-congress/private-law/{np.random.randint(1, 500)}" for c in congress_numbers]
     }
     
-    return pd.DataFrame(data).sort_values('date').reset_index(drop=True)
+    df = sort_by_year(pd.DataFrame(data))
+    return add_derived_columns(df)
 
 
 def get_ordinal_suffix(n):
@@ -111,20 +381,58 @@ def truncate_label(text, max_length=25):
     return str(text)
 
 
-def count_categories(df, category_column, valid_categories):
-    """Count category assignments from a column that may contain multiple categories."""
-    counts = {cat: 0 for cat in valid_categories}
-    sorted_categories = sorted(valid_categories, key=len, reverse=True)
+def split_categories(value, categories):
+    """Return the known categories listed in a comma-joined category string.
     
-    for value in df[category_column]:
-        if pd.isna(value) or value == '':
-            continue
-        
-        value_str = str(value).strip()
-        
-        for cat in sorted_categories:
-            if cat in value_str:
-                counts[cat] += 1
-                value_str = value_str.replace(cat, '', 1)
+    Category names can contain commas themselves, so the string is consumed
+    left to right, taking the longest known name that ends at a separator.
+    Unknown segments are skipped.
+    """
+    by_length = sorted(categories, key=len, reverse=True)
+    found = []
+    rest = str(value).strip()
     
-    return counts
+    while rest:
+        for cat in by_length:
+            tail = rest[len(cat):].lstrip()
+            if rest.startswith(cat) and (not tail or tail.startswith(',')):
+                found.append(cat)
+                rest = tail[1:].lstrip()
+                break
+        else:
+            sep = rest.find(',')
+            rest = rest[sep + 1:].lstrip() if sep >= 0 else ''
+    
+    return found
+
+
+def encode_categories(values, categories):
+    """Encode a column of comma-joined category strings as int64 bitmasks, bit i = categories[i]."""
+    bits = {cat: 1 << i for i, cat in enumerate(categories)}
+    codes, uniques = pd.factorize(values.to_numpy(dtype=object))
+    unique_masks = np.array(
+        [sum(bits[cat] for cat in set(split_categories(v, categories))) for v in uniques],
+        dtype=np.int64
+    )
+    if not len(unique_masks):
+        return np.zeros(len(codes), dtype=np.int64)
+    return np.where(codes >= 0, unique_masks[codes], 0)
+
+
+def category_bit(category, categories):
+    """Bitmask for a single category, or 0 if it is not a known category."""
+    try:
+        return 1 << categories.index(category)
+    except ValueError:
+        return 0
+
+
+def count_categories(df, category_column, valid_categories):
+    """Count category assignments from a column that may contain multiple categories."""
+    mask_column = CATEGORY_MASK_COLUMNS.get(category_column)
+    if mask_column in df.columns:
+        masks = df[mask_column].to_numpy()
+    else:
+        masks = encode_categories(df[category_column], valid_categories)
+    masks = np.asarray(masks, dtype=np.int64)
+    return {category: int(np.count_nonzero(masks & (1 << i))) for i, category in enumerate(valid_categories)}
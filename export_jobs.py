@@ -0,0 +1,167 @@
+"""
+Background export jobs for Private Laws Dashboard
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from exporters import EXPORT_COLUMNS, EXPORT_FORMATS, arrow_schema, iter_frames
+
+
+# A running job whose progress file has not been touched for this long is assumed dead
+STALE_SECONDS = 60
+
+
+class ExportJobs:
+    """Writes exports to files on a bounded pool of background threads.
+    
+    Each job is identified by its filter spec, format and dataset version, so
+    identical exports share one artifact in directory. Progress lives in a JSON
+    file next to the artifact, which lets any worker process report on any job.
+    Finished artifacts are kept until their total size exceeds max_bytes.
+    """
+
+    def __init__(self, engine, directory, dataset_version, max_workers=2, max_bytes=2 * 1024 * 1024 * 1024):
+        self.engine = engine
+        self.directory = directory
+        self.dataset_version = dataset_version
+        self.max_bytes = max_bytes
+        self.columns = [c for c in EXPORT_COLUMNS if c in engine.df.columns]
+        self.schema = arrow_schema(engine.df[self.columns])
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='export')
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def job_id(self, year_range, subject, relief, search, extension):
+        """Stable id of an export, used in artifact and progress file names."""
+        spec = self.engine.spec(year_range, subject, relief, search)
+        key = json.dumps([spec, extension, self.dataset_version])
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+
+    def submit(self, year_range, subject=None, relief=None, search=None, extension='csv'):
+        """Start exporting the filtered laws (unless already done, queued or running) and return the job id."""
+        export_format = EXPORT_FORMATS[extension]
+        job_id = self.job_id(year_range, subject, relief, search, extension)
+        filename = f"private_laws_{int(year_range[0])}_{int(year_range[1])}.{extension}"
+        
+        with self._lock:
+            status = self.status(job_id)
+            if status and status['state'] == 'done' and os.path.exists(self.artifact_path(job_id)):
+                os.utime(self.artifact_path(job_id))
+                return job_id
+            if status and status['state'] in ('queued', 'running'):
+                return job_id
+            
+            # Queued jobs may wait for a worker indefinitely; only running ones can go stale
+            positions = self.engine.select(year_range, subject, relief, search)
+            self._write_status(job_id, 'queued', filename, export_format['mimetype'], 0, len(positions))
+        
+        self._executor.submit(self._run, job_id, positions, export_format, filename)
+        return job_id
+
+    def _run(self, job_id, positions, export_format, filename):
+        """Write the artifact to a temp file, reporting progress per chunk, then move it into place."""
+        total = len(positions)
+        mimetype = export_format['mimetype']
+
+        def counted(frames):
+            done = 0
+            for frame in frames:
+                yield frame
+                done += len(frame)
+                self._write_status(job_id, 'running', filename, mimetype, done, total)
+        
+        self._write_status(job_id, 'running', filename, mimetype, 0, total)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in export_format['write'](counted(iter_frames(self.engine, positions, self.columns)), self.schema):
+                    f.write(chunk)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self.artifact_path(job_id))
+            self._write_status(job_id, 'done', filename, mimetype, total, total)
+        except Exception as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            self._write_status(job_id, 'failed', filename, mimetype, 0, total, error=str(e))
+            print(f"⚠ Export {job_id} failed: {e}")
+            return
+        self._evict()
+
+    def artifact_path(self, job_id):
+        """Path of the finished export file of a job."""
+        return os.path.join(self.directory, f"{job_id}.export")
+
+    def _status_path(self, job_id):
+        """Path of the JSON progress file of a job."""
+        return os.path.join(self.directory, f"{job_id}.json")
+
+    def status(self, job_id):
+        """Progress dict of a job (state, filename, mimetype, rows_done, rows_total, size, updated), or None.
+        
+        state is 'queued', 'running', 'done' or 'failed'.
+        """
+        try:
+            with open(self._status_path(job_id)) as f:
+                status = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # A job whose worker died never updates its file again
+        if status['state'] == 'running' and time.time() - status['updated'] >= STALE_SECONDS:
+            status.update(state='failed', error="Export stopped making progress")
+        return status
+
+    def _write_status(self, job_id, state, filename, mimetype, rows_done, rows_total, error=None):
+        status = {
+            'state': state,
+            'filename': filename,
+            'mimetype': mimetype,
+            'rows_done': rows_done,
+            'rows_total': rows_total,
+            'size': os.path.getsize(self.artifact_path(job_id)) if state == 'done' else None,
+            'error': error,
+            'updated': time.time()
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.json.part')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(status, f)
+        os.replace(tmp_path, self._status_path(job_id))
+
+    def _evict(self):
+        """Delete least recently requested artifacts (and their progress files) beyond max_bytes.
+        
+        Temp files left behind by crashed jobs are removed once they go stale.
+        """
+        artifacts = []
+        now = time.time()
+        for name in os.listdir(self.directory):
+            if not name.endswith(('.export', '.part')):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if name.endswith('.export'):
+                artifacts.append((stat.st_mtime, stat.st_size, name[:-len('.export')]))
+            elif now - stat.st_mtime >= STALE_SECONDS:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+        
+        total = sum(size for _, size, _ in artifacts)
+        for _, size, job_id in sorted(artifacts):
+            if total <= self.max_bytes:
+                break
+            for path in (self.artifact_path(job_id), self._status_path(job_id)):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
@@ -0,0 +1,132 @@
+"""
+Export file formats for Private Laws Dashboard
+"""
+
+import zlib
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    print("⚠ pyarrow is not installed; Parquet and Feather exports are disabled (pip install pyarrow)")
+
+
+# Columns written to exported files
+EXPORT_COLUMNS = ['congress', 'volume', 'chapter', 'title', 'date', 'year', 'subject_category', 'relief_category',
+                  'summary', 'pdf_link', 'details_link']
+
+# extension -> {'label', 'mimetype', 'write'}; write(frames, schema) turns DataFrame chunks into bytes chunks
+EXPORT_FORMATS = {}
+
+# Rows rendered per chunk; bounds export memory whatever the selection size
+EXPORT_CHUNK_ROWS = 2000
+
+
+def export_format(extension, label, mimetype):
+    """Register a streaming writer under a file extension."""
+    def register(write):
+        EXPORT_FORMATS[extension] = {'label': label, 'mimetype': mimetype, 'write': write}
+        return write
+    return register
+
+
+def iter_frames(engine, positions, columns, chunk_rows=EXPORT_CHUNK_ROWS):
+    """DataFrame chunks of the selected rows (one empty frame for an empty selection)."""
+    for start in range(0, max(len(positions), 1), chunk_rows):
+        yield engine.rows(positions[start:start + chunk_rows], columns)
+
+
+# =============================================================================
+# TEXT FORMATS
+# =============================================================================
+
+@export_format('csv', 'CSV', 'text/csv')
+def write_csv(frames, schema=None):
+    """CSV, header first."""
+    for i, frame in enumerate(frames):
+        yield frame.to_csv(index=False, header=i == 0).encode('utf-8')
+
+
+@export_format('csv.gz', 'CSV (gzip)', 'application/gzip')
+def write_csv_gzip(frames, schema=None):
+    """Gzip-compressed CSV, compressed incrementally as chunks are rendered."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in write_csv(frames):
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+@export_format('jsonl', 'JSON Lines', 'application/x-ndjson')
+def write_json_lines(frames, schema=None):
+    """One JSON object per row, dates in ISO 8601 and missing values as null."""
+    for frame in frames:
+        if len(frame):
+            yield frame.to_json(orient='records', lines=True, date_format='iso').encode('utf-8')
+
+
+# =============================================================================
+# COLUMNAR FORMATS (need pyarrow)
+# =============================================================================
+
+class _ChunkSink:
+    """Write-only file object that hands back whatever was written since the last drain."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data):
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def arrow_schema(frame):
+    """Arrow schema for exported chunks, inferred once from the full frame (None without pyarrow)."""
+    if pa is None:
+        return None
+    return pa.Schema.from_pandas(frame, preserve_index=False)
+
+
+def _write_arrow(frames, schema, open_writer):
+    """Write each chunk as one record batch / row group and yield the bytes produced so far."""
+    sink = _ChunkSink()
+    writer = open_writer(sink, schema)
+    for frame in frames:
+        writer.write_table(pa.Table.from_pandas(frame, schema=schema, preserve_index=False))
+        data = sink.drain()
+        if data:
+            yield data
+    writer.close()
+    yield sink.drain()
+
+
+if pa is not None:
+    @export_format('parquet', 'Parquet', 'application/vnd.apache.parquet')
+    def write_parquet(frames, schema):
+        """Parquet, one row group per chunk."""
+        return _write_arrow(frames, schema, lambda sink, schema: pq.ParquetWriter(sink, schema, compression='zstd'))
+
+    @export_format('feather', 'Feather', 'application/vnd.apache.arrow.file')
+    def write_feather(frames, schema):
+        """Feather v2 (Arrow IPC file), one record batch per chunk."""
+        return _write_arrow(frames, schema, pa.ipc.new_file)
@@ -0,0 +1,119 @@
+"""
+Chart figures for Private Laws Dashboard
+"""
+
+from functools import lru_cache
+
+import plotly.graph_objects as go
+from dash import Patch
+
+from styles import COLORS
+
+
+# Axis title and hover text of the timeline for each timeline-view-toggle value
+TIMELINE_VIEWS = {
+    'year': {'x_title': 'Year', 'hovertemplate': 'Year: %{x}<br>Laws: %{y:,}<extra></extra>'},
+    'congress': {'x_title': 'Congress', 'hovertemplate': 'Congress: %{x}<br>Laws: %{y:,}<extra></extra>'}
+}
+
+
+# =============================================================================
+# TEMPLATES (validated by plotly once, then reused as plain dicts)
+# =============================================================================
+
+def _timeline_go_figure():
+    """Empty timeline bar chart carrying all static styling, as a plotly Figure."""
+    fig = go.Figure(data=[go.Bar(x=[], y=[], marker_color=COLORS['bar_default'])])
+    
+    fig.update_layout(
+        plot_bgcolor=COLORS['bg_card'],
+        paper_bgcolor=COLORS['bg_card'],
+        font_color=COLORS['text_primary'],
+        margin=dict(l=50, r=20, t=10, b=40),
+        xaxis=dict(
+            gridcolor=COLORS['border'],
+            showgrid=False,
+            title='Year',
+            title_font=dict(size=11, color=COLORS['text_secondary'])
+        ),
+        yaxis=dict(
+            gridcolor=COLORS['border'],
+            showgrid=True,
+            title='Private Laws',
+            title_font=dict(size=11, color=COLORS['text_secondary'])
+        ),
+        hoverlabel=dict(bgcolor=COLORS['bg_elevated'], font_color=COLORS['text_primary']),
+        bargap=0.15
+    )
+    return fig
+
+
+def _breakdown_go_figure(height=None):
+    """Empty horizontal category bar chart carrying all static styling, as a plotly Figure."""
+    fig = go.Figure(data=[
+        go.Bar(
+            y=[],
+            x=[],
+            orientation='h',
+            marker_color=COLORS['bar_default'],
+            textposition='outside',
+            textfont=dict(size=9, color=COLORS['text_secondary']),
+            hovertemplate='%{customdata}<br>%{x:.1f}%<extra></extra>'
+        )
+    ])
+    
+    fig.update_layout(
+        plot_bgcolor=COLORS['bg_card'],
+        paper_bgcolor=COLORS['bg_card'],
+        font_color=COLORS['text_primary'],
+        margin=dict(l=120, r=45, t=5, b=5),
+        height=height,
+        xaxis=dict(showgrid=False, showticklabels=False, range=[0, 100]),
+        yaxis=dict(showgrid=False, tickfont=dict(size=9, color=COLORS['text_secondary'])),
+        hoverlabel=dict(bgcolor=COLORS['bg_elevated'], font_color=COLORS['text_primary']),
+        bargap=0.25
+    )
+    return fig
+
+
+@lru_cache(maxsize=None)
+def _timeline_template():
+    return _timeline_go_figure().to_plotly_json()
+
+
+@lru_cache(maxsize=None)
+def _breakdown_template(height=None):
+    return _breakdown_go_figure(height).to_plotly_json()
+
+
+# =============================================================================
+# FIGURES
+# =============================================================================
+# The layout renders these once; breakdown callbacks then only send patches of the
+# data, and the timeline is filled in clientside from the timeline-series Store.
+# Templates are shared, so returned figures must be treated as read-only.
+
+def timeline_figure():
+    """Empty timeline figure dict carrying all static styling."""
+    return _timeline_template()
+
+
+def breakdown_figure(height=None):
+    """Empty category breakdown figure dict carrying all static styling."""
+    return _breakdown_template(height)
+
+
+# =============================================================================
+# PATCHES
+# =============================================================================
+
+def breakdown_patch(series):
+    """Patch updating breakdown bars from a dict of labels, percentages, colors, text, categories and range."""
+    patch = Patch()
+    patch['data'][0]['y'] = series['labels']
+    patch['data'][0]['x'] = series['percentages']
+    patch['data'][0]['marker']['color'] = series['colors']
+    patch['data'][0]['text'] = series['text']
+    patch['data'][0]['customdata'] = series['categories']
+    patch['layout']['xaxis']['range'] = series['range']
+    return patch
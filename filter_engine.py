@@ -0,0 +1,162 @@
+"""
+Shared row selection for Private Laws Dashboard
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from config import SUBJECT_CATEGORIES, RELIEF_CATEGORIES
+from data_loader import category_bit
+from record_index import RecordIndex
+from search_index import InvertedIndex, TrigramIndex, intersect_sorted
+
+
+# Columns the search box matches substrings against
+SEARCH_COLUMNS = ['title', 'date', 'subject_category', 'relief_category']
+
+# Columns covered by whole-word search
+WORD_SEARCH_COLUMNS = SEARCH_COLUMNS + ['summary']
+
+# Table display columns that sort by an underlying data column
+SORT_COLUMNS = {'date_str': 'date', 'subject_short': 'subject_category'}
+
+
+class FilterEngine:
+    """Resolves the dashboard filters to row positions, memoizing recent selections.
+    
+    Rows must be sorted by year, so a year range is a contiguous slice found
+    from a year->offset index and the other filters only scan that slice.
+    A selection is a read-only sorted int64 array of row positions in df, shared
+    by every caller that asks for the same filters. Memoized selections are
+    capped by count and by total array bytes.
+    """
+
+    def __init__(self, df, max_entries=256, max_bytes=32 * 1024 * 1024):
+        self.df = df
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.cached_bytes = 0
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._sort_ranks = {}
+        
+        years = df['year'].to_numpy()
+        if len(years) and np.any(years[1:] < years[:-1]):
+            raise ValueError("FilterEngine needs rows sorted by year (see data_loader.sort_by_year)")
+        
+        # _year_offsets[y - first_year] is the first row dated year y or later
+        self._first_year = int(years[0]) if len(years) else 0
+        last_year = int(years[-1]) if len(years) else -1
+        self._year_offsets = np.searchsorted(years, np.arange(self._first_year, last_year + 2))
+        self._subject_masks = df['subject_mask'].to_numpy()
+        self._relief_masks = df['relief_mask'].to_numpy()
+        self.records = RecordIndex(df)
+        self.trigram_index = TrigramIndex.from_frame(df, SEARCH_COLUMNS)
+        self.word_index = InvertedIndex.from_frame(df, WORD_SEARCH_COLUMNS)
+
+    @staticmethod
+    def spec(year_range, subject=None, relief=None, search=None):
+        """Normalize filter inputs to a hashable spec."""
+        start_year, end_year = year_range
+        return (int(start_year), int(end_year), subject or None, relief or None, search or None)
+
+    def select(self, year_range, subject=None, relief=None, search=None):
+        """Row positions matching the filters."""
+        key = self.spec(year_range, subject, relief, search)
+        start_year, end_year, subject, relief, search = key
+        
+        def compute():
+            if search:
+                # Keystrokes share the unsearched selection and only scan its rows
+                return self._search(self.select(year_range, subject, relief), search)
+            
+            lo, hi = self.year_bounds(start_year, end_year)
+            if not (subject or relief):
+                return np.arange(lo, hi)
+            
+            mask = np.ones(hi - lo, dtype=bool)
+            if subject:
+                mask &= (self._subject_masks[lo:hi] & category_bit(subject, SUBJECT_CATEGORIES)) != 0
+            if relief:
+                mask &= (self._relief_masks[lo:hi] & category_bit(relief, RELIEF_CATEGORIES)) != 0
+            return lo + np.flatnonzero(mask)
+        
+        return self._cached(key, compute)
+    
+    def select_sorted(self, year_range, subject=None, relief=None, search=None, sort_by=None):
+        """Row positions matching the filters, ordered by a DataTable sort_by list."""
+        positions = self.select(year_range, subject, relief, search)
+        sort_key = tuple((item['column_id'], item['direction']) for item in sort_by or [])
+        if not sort_key or not len(positions):
+            return positions
+        
+        def compute():
+            # np.lexsort treats its last key as primary; it is stable, so ties keep date order
+            keys = [self._sort_rank(column, direction)[positions] for column, direction in reversed(sort_key)]
+            return positions[np.lexsort(keys)]
+        
+        return self._cached(self.spec(year_range, subject, relief, search) + (sort_key,), compute)
+    
+    def _cached(self, key, compute):
+        """Memoized compute() result for key, as a read-only array."""
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._cache[key]
+            self.misses += 1
+        
+        positions = compute()
+        positions.flags.writeable = False
+        if positions.nbytes > self.max_bytes:
+            return positions
+        with self._lock:
+            if key in self._cache:
+                self.cached_bytes -= self._cache.pop(key).nbytes
+            self._cache[key] = positions
+            self.cached_bytes += positions.nbytes
+            while len(self._cache) > self.max_entries or self.cached_bytes > self.max_bytes:
+                _, evicted = self._cache.popitem(last=False)
+                self.cached_bytes -= evicted.nbytes
+        return positions
+    
+    def stats(self):
+        """Counters for monitoring."""
+        with self._lock:
+            return {'entries': len(self._cache), 'bytes': self.cached_bytes, 'hits': self.hits, 'misses': self.misses}
+    
+    def _sort_rank(self, column, direction):
+        """Per-row rank of column in the given direction, with missing values last."""
+        key = (column, direction)
+        if key not in self._sort_ranks:
+            values = self.df[SORT_COLUMNS.get(column, column)]
+            ranks = values.rank(method='min', ascending=direction != 'desc', na_option='bottom')
+            self._sort_ranks[key] = ranks.to_numpy(dtype=np.int64)
+        return self._sort_ranks[key]
+    
+    def year_bounds(self, start_year, end_year):
+        """Row offsets [lo, hi) of the laws dated start_year..end_year."""
+        n_offsets = len(self._year_offsets)
+        lo = min(max(start_year - self._first_year, 0), n_offsets - 1)
+        hi = min(max(end_year - self._first_year + 1, lo), n_offsets - 1)
+        return int(self._year_offsets[lo]), int(self._year_offsets[hi])
+    
+    def rows(self, positions, columns=None):
+        """DataFrame rows for a selection, optionally limited to columns."""
+        frame = self.df if columns is None else self.df[columns]
+        return frame.iloc[positions]
+
+    def search_words(self, positions, query):
+        """Subset of positions containing every word of query, the last one as a prefix."""
+        matches = self.word_index.search(query)
+        if matches is None:
+            return positions
+        return intersect_sorted(positions, matches)
+    
+    def _search(self, positions, search_value):
+        """Subset of positions with a search column containing search_value (case-insensitive)."""
+        return self.trigram_index.search(search_value, positions)
@@ -4,6 +4,8 @@ Layout components for Private Laws Dashboard
 
 from dash import dcc, html, dash_table
 from styles import COLORS, section_header_style, subsection_header_style, card_style, gradient_divider
+from figures import timeline_figure, breakdown_figure
+from exporters import EXPORT_FORMATS
 
 
 def create_layout():
@@ -14,7 +16,7 @@ def create_layout():
         dcc.Store(id='selected-relief-category', data=None),
         dcc.Store(id='selected-law-id', data=None),
         dcc.Store(id='current-year-range', data=[1789, 2025]),
-        dcc.Download(id='download-csv'),
+        dcc.Store(id='timeline-series', data=None),
         
         # Header
         html.Div([
@@ -99,6 +101,7 @@ def _create_timeline_panel():
         # Timeline Chart
         dcc.Graph(
             id='timeline-chart',
+            figure=timeline_figure(),
             config={'displayModeBar': False},
             style={'height': '250px'}
         ),
@@ -187,6 +190,10 @@ def _create_laws_list_panel():
     return html.Div([
         html.Div([
             html.H2("List of Private Laws", style={**section_header_style(), 'display': 'inline-block', 'marginRight': '20px'}),
+            html.Span(id='table-row-count', style={
+                'color': COLORS['text_secondary'],
+                'fontSize': '13px'
+            })
         ], style={'marginBottom': '16px'}),
         
         # Search and Controls Row
@@ -233,10 +240,18 @@ def _create_laws_list_panel():
                     style={'width': '70px', 'display': 'inline-block'}
                 ),
                 
+                # Export format and button; the file is written in the background and offered once ready
+                dcc.Dropdown(
+                    id='export-format',
+                    options=[{'label': fmt['label'], 'value': extension} for extension, fmt in EXPORT_FORMATS.items()],
+                    value='csv',
+                    clearable=False,
+                    style={'width': '130px', 'display': 'inline-block', 'marginLeft': '16px'}
+                ),
                 html.Button([
-                    '↓ Export CSV'
+                    '↓ Export'
                 ], id='export-btn', style={
-                    'marginLeft': '16px',
+                    'marginLeft': '8px',
                     'padding': '8px 16px',
                     'backgroundColor': COLORS['accent_dark'],
                     'border': 'none',
@@ -245,7 +260,10 @@ def _create_laws_list_panel():
                     'cursor': 'pointer',
                     'fontSize': '13px',
                     'fontWeight': '500'
-                })
+                }),
+                html.Div(id='export-status', style={'marginLeft': '12px', 'fontSize': '12px', 'color': COLORS['text_secondary']}),
+                dcc.Store(id='export-job', data=None),
+                dcc.Interval(id='export-poll', interval=500, disabled=True)
             ], style={'display': 'inline-flex', 'alignItems': 'center'})
         ], style={
             'display': 'flex',
@@ -271,9 +289,11 @@ def _create_laws_list_panel():
                 ],
                 page_size=20,
                 page_current=0,
-                page_action='native',
-                sort_action='native',
+                page_count=1,
+                page_action='custom',
+                sort_action='custom',
                 sort_mode='multi',
+                sort_by=[],
                 style_table={
                     'overflowX': 'auto',
                     'overflowY': 'auto',
@@ -369,6 +389,7 @@ def _create_breakdown_panel():
                 html.Div([
                     dcc.Graph(
                         id='subject-breakdown-chart',
+                        figure=breakdown_figure(),
                         config={'displayModeBar': False},
                         style={'height': '180px'}
                     )
@@ -412,7 +433,47 @@ def _create_breakdown_panel():
                 })
             ], style={'display': 'flex', 'justifyContent': 'space-between', 'alignItems': 'flex-start', 'marginBottom': '8px'}),
             
-            html.Div(id='relief-section-content')
+            # Chart and table, hidden in favour of the placeholder while there is no relief data
+            html.Div(id='relief-chart-container', children=[
+                html.Div([
+                    dcc.Graph(
+                        id='relief-breakdown-chart',
+                        figure=breakdown_figure(height=180),
+                        config={'displayModeBar': False},
+                        style={'height': '180px'}
+                    )
+                ], style={'width': '55%', 'display': 'inline-block', 'verticalAlign': 'top'}),
+                html.Div([
+                    html.Div(id='relief-counts-table', style={
+                        'maxHeight': '180px',
+                        'overflowY': 'auto',
+                        'border': f"1px solid {COLORS['border']}",
+                        'borderRadius': '4px'
+                    })
+                ], style={'width': '45%', 'display': 'inline-block', 'verticalAlign': 'top', 'paddingLeft': '8px'})
+            ], style={'display': 'none'}),
+            
+            html.Div(id='relief-placeholder', children=[
+                html.Div([
+                    html.Span("📊", style={'fontSize': '36px', 'marginBottom': '12px', 'display': 'block'}),
+                    html.P("Relief category data coming soon", style={
+                        'color': COLORS['text_muted'],
+                        'fontSize': '13px',
+                        'margin': '0 0 4px 0'
+                    }),
+                    html.P("This section will populate automatically once data is available.", style={
+                        'color': COLORS['text_muted'],
+                        'fontSize': '11px',
+                        'margin': '0'
+                    })
+                ], style={
+                    'textAlign': 'center',
+                    'padding': '40px 20px',
+                    'backgroundColor': COLORS['bg_dark'],
+                    'borderRadius': '6px',
+                    'border': f"1px dashed {COLORS['border']}"
+                })
+            ], style={'display': 'none'})
         ])
     ], style={**card_style(), 'marginBottom': '20px', 'minHeight': '420px'})
 
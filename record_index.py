@@ -0,0 +1,34 @@
+"""
+Direct record lookup for Private Laws Dashboard
+"""
+
+import numpy as np
+
+
+# Columns a single law can be looked up by
+LOOKUP_COLUMNS = ['id', 'granuleId', 'privateLawNumber']
+
+
+class RecordIndex:
+    """Constant-time row position lookup by id, granuleId or privateLawNumber."""
+    
+    def __init__(self, df, columns=LOOKUP_COLUMNS):
+        self.df = df
+        self._positions = {}
+        for col in columns:
+            if col not in df.columns:
+                continue
+            present = df[col].notna().to_numpy()
+            values = df[col].to_numpy()[present].tolist()
+            positions = np.flatnonzero(present).tolist()
+            # Built back to front so a duplicated key resolves to its first row
+            self._positions[col] = dict(zip(reversed(values), reversed(positions)))
+    
+    def position(self, column, value):
+        """Row position of the law whose column equals value, or None."""
+        return self._positions.get(column, {}).get(value)
+    
+    def record(self, column, value):
+        """The full row for the law whose column equals value, or None."""
+        pos = self.position(column, value)
+        return None if pos is None else self.df.iloc[pos]
@@ -0,0 +1,97 @@
+"""
+Callback response caching for Private Laws Dashboard
+"""
+
+import json
+import threading
+from collections import OrderedDict
+
+from plotly.io.json import to_json_plotly
+
+from shared_cache import cache_key
+
+
+class ResponseCache:
+    """Bounded LRU of serialized callback outputs, capped by entry count and total bytes.
+    
+    Outputs are stored as the UTF-8 JSON Dash would send, so a hit skips building
+    figures and components entirely and returns the decoded plain structures.
+    With a SharedCache as second tier, local misses are looked up on disk under
+    namespace before computing, so workers reuse each other's results.
+    """
+    
+    def __init__(self, max_entries=256, max_bytes=64 * 1024 * 1024, shared=None, namespace='responses'):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.shared = shared
+        self.namespace = namespace
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """Decoded outputs cached for key, or None."""
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return json.loads(payload)
+        
+        if self.shared is not None:
+            payload = self.shared.get(cache_key(self.namespace, key))
+            if payload is not None:
+                self._store(key, payload)
+                with self._lock:
+                    self.shared_hits += 1
+                return json.loads(payload)
+        
+        with self._lock:
+            self.misses += 1
+        return None
+    
+    def set(self, key, outputs):
+        """Serialize and store outputs for key in both tiers."""
+        payload = to_json_plotly(outputs).encode('utf-8')
+        self._store(key, payload)
+        if self.shared is not None:
+            self.shared.set(cache_key(self.namespace, key), payload)
+    
+    def _store(self, key, payload):
+        """Keep payload in the local LRU, evicting least recently used entries over the caps."""
+        if len(payload) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.total_bytes -= len(self._entries.pop(key))
+            self._entries[key] = payload
+            self.total_bytes += len(payload)
+            while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.total_bytes -= len(evicted)
+                self.evictions += 1
+    
+    def get_or_compute(self, key, compute):
+        """Cached outputs for key, computing and storing them on a miss."""
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        outputs = compute()
+        self.set(key, list(outputs))
+        return outputs
+    
+    def stats(self):
+        """Counters for monitoring."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.total_bytes,
+                'hits': self.hits,
+                'shared_hits': self.shared_hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
@@ -0,0 +1,117 @@
+"""
+Response compression and caching headers for Private Laws Dashboard
+"""
+
+import gzip
+import threading
+import time
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class ResponseCompressor:
+    """Compresses JSON and HTML bodies for clients that accept it, counting the work per route.
+    
+    Brotli is preferred when the brotli package is installed and the client
+    accepts it, otherwise gzip. Streamed and file responses (exports) pass
+    through untouched, as do bodies below min_bytes.
+    """
+
+    def __init__(self, min_bytes=1024, mimetypes=('application/json', 'text/html'), gzip_level=6, brotli_quality=5):
+        self.min_bytes = min_bytes
+        self.mimetypes = set(mimetypes)
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def encoding_for(self, accept_encodings):
+        """Best supported content coding the client accepts, or None."""
+        if brotli is not None and accept_encodings['br']:
+            return 'br'
+        if accept_encodings['gzip']:
+            return 'gzip'
+        return None
+
+    def compress(self, data, encoding):
+        """data compressed with the given content coding."""
+        if encoding == 'br':
+            return brotli.compress(data, quality=self.brotli_quality)
+        return gzip.compress(data, compresslevel=self.gzip_level, mtime=0)
+
+    def process(self, response, route):
+        """Compress response in place when its type, size and the request's Accept-Encoding allow."""
+        if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+                or response.mimetype not in self.mimetypes or 'Content-Encoding' in response.headers):
+            return response
+        response.vary.add('Accept-Encoding')
+        
+        encoding = self.encoding_for(request.accept_encodings)
+        data = response.get_data()
+        if encoding is None or len(data) < self.min_bytes:
+            self._record(route, len(data), len(data), 0.0, compressed=False)
+            return response
+        
+        start = time.perf_counter()
+        compressed = self.compress(data, encoding)
+        elapsed = time.perf_counter() - start
+        
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        # The compressed body is a different representation of the same content
+        etag, _ = response.get_etag()
+        if etag:
+            response.set_etag(etag, weak=True)
+        self._record(route, len(data), len(compressed), elapsed, compressed=True)
+        return response
+
+    def _record(self, route, bytes_in, bytes_out, seconds, compressed):
+        with self._lock:
+            counters = self._routes.setdefault(route, {
+                'responses': 0, 'compressed': 0, 'bytes_in': 0, 'bytes_out': 0, 'seconds': 0.0
+            })
+            counters['responses'] += 1
+            counters['compressed'] += int(compressed)
+            counters['bytes_in'] += bytes_in
+            counters['bytes_out'] += bytes_out
+            counters['seconds'] += seconds
+
+    def stats(self):
+        """Per-route counters for monitoring, with bytes saved and compression time in milliseconds."""
+        with self._lock:
+            return {
+                route: {
+                    'responses': counters['responses'],
+                    'compressed': counters['compressed'],
+                    'bytes_in': counters['bytes_in'],
+                    'bytes_saved': counters['bytes_in'] - counters['bytes_out'],
+                    'compress_ms': round(counters['seconds'] * 1000, 3)
+                }
+                for route, counters in self._routes.items()
+            }
+
+
+def register_response_headers(server, compressor, static_max_age):
+    """Compress eligible responses and mark versioned static assets immutable."""
+
+    def versioned_static(response):
+        """Whether the response is a static file whose URL changes with its content."""
+        if '/_dash-component-suites/' in request.path:
+            # Dash sets max-age only on fingerprinted component files
+            return response.cache_control.max_age is not None
+        return (request.endpoint or '').endswith('dash_assets.static') and 'm' in request.args
+
+    @server.after_request
+    def set_response_headers(response):
+        if response.status_code == 200 and versioned_static(response):
+            response.cache_control.public = True
+            response.cache_control.max_age = static_max_age
+            response.cache_control.immutable = True
+            return response
+        route = request.url_rule.rule if request.url_rule is not None else request.path
+        return compressor.process(response, route)
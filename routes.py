@@ -0,0 +1,72 @@
+"""
+Flask routes served alongside the Dash app for Private Laws Dashboard
+"""
+
+import re
+
+from flask import Response, abort, jsonify, request, send_file
+
+from exporters import EXPORT_COLUMNS, EXPORT_FORMATS, arrow_schema, iter_frames
+
+
+_JOB_ID_RE = re.compile(r'^[0-9a-f]{32}$')
+
+
+def filter_args(args, df):
+    """Filter inputs (year_range, subject, relief, search) from query parameters; ValueError if invalid."""
+    try:
+        start_year = int(args.get('start', df['year'].min()))
+        end_year = int(args.get('end', df['year'].max()))
+    except ValueError:
+        raise ValueError("start and end must be integer years")
+    return [start_year, end_year], args.get('subject') or None, args.get('relief') or None, args.get('search') or None
+
+
+def register_routes(server, df, engine, export_jobs):
+    """Register the non-Dash routes with the Flask server."""
+    
+    export_columns = [c for c in EXPORT_COLUMNS if c in df.columns]
+    
+    # Columnar formats need one schema for every chunk, or all-null chunks would change column types
+    export_schema = arrow_schema(df[export_columns])
+
+    @server.route('/export/laws.<path:extension>')
+    def export_laws(extension):
+        """Stream the laws matching the dashboard filters in the format named by the extension."""
+        export_format = EXPORT_FORMATS.get(extension)
+        if export_format is None:
+            abort(404, description=f"Unknown export format: {extension}")
+        
+        try:
+            year_range, subject, relief, search = filter_args(request.args, df)
+        except ValueError as e:
+            abort(400, description=str(e))
+        positions = engine.select(year_range, subject, relief, search)
+        
+        filename = f"private_laws_{year_range[0]}_{year_range[1]}.{extension}"
+        return Response(
+            export_format['write'](iter_frames(engine, positions, export_columns), export_schema),
+            mimetype=export_format['mimetype'],
+            headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+        )
+
+    @server.route('/export/files/<job_id>')
+    def export_file(job_id):
+        """Download the artifact of a finished background export job."""
+        status = export_jobs.status(job_id) if _JOB_ID_RE.match(job_id) else None
+        if status is None or status['state'] != 'done':
+            abort(404, description="Export not found or not finished")
+        return send_file(
+            export_jobs.artifact_path(job_id),
+            mimetype=status['mimetype'],
+            as_attachment=True,
+            download_name=status['filename']
+        )
+
+
+def register_metrics(server, sources):
+    """Serve the stats() of each named source as JSON at /debug/metrics (counters are per worker process)."""
+
+    @server.route('/debug/metrics')
+    def metrics():
+        return jsonify({name: source.stats() for name, source in sources.items()})
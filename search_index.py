@@ -0,0 +1,213 @@
+"""
+Full-text search indexes for Private Laws Dashboard
+"""
+
+import bisect
+import itertools
+import re
+
+import numpy as np
+import pandas as pd
+
+from data_loader import cached_arrays
+
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+# Bump whenever tokenization, haystack text or the index array layout changes so cached indexes are rebuilt
+INDEX_VERSION = 1
+
+
+def tokenize(text):
+    """Lowercase alphanumeric tokens of text."""
+    return _TOKEN_RE.findall(str(text).lower())
+
+
+# Joins fields in trigram haystacks; no query can contain it, so matches never span two fields
+FIELD_SEP = '\x00'
+
+
+def searchable_text(df, columns, sep=' '):
+    """One lowercase string per row joining the given columns (missing values become '')."""
+    text = df[columns[0]].astype(str).fillna('')
+    for col in columns[1:]:
+        text = text + sep + df[col].astype(str).fillna('')
+    return text.str.lower()
+
+
+def intersect_sorted(a, b):
+    """Intersection of two sorted unique int arrays, probing the shorter into the longer."""
+    if len(a) > len(b):
+        a, b = b, a
+    if not len(a):
+        return a
+    idx = np.minimum(np.searchsorted(b, a), len(b) - 1)
+    return a[b[idx] == a]
+
+
+class InvertedIndex:
+    """Token -> sorted row positions over a set of text columns.
+    
+    Posting lists are slices of one int64 array, with tokens kept in a sorted
+    vocabulary so the term being typed can be matched as a prefix.
+    """
+
+    def __init__(self, vocab, offsets, postings, n_rows):
+        self.vocab = list(vocab)
+        self.offsets = offsets
+        self.postings = postings
+        self.n_rows = n_rows
+
+    @classmethod
+    def build(cls, texts):
+        """Index a sequence of per-row strings (texts[i] is row position i)."""
+        token_sets = [set(_TOKEN_RE.findall(text.lower())) for text in texts]
+        sizes = np.fromiter(map(len, token_sets), dtype=np.int64, count=len(token_sets))
+        rows = np.repeat(np.arange(len(token_sets), dtype=np.int64), sizes)
+        tokens = np.array(list(itertools.chain.from_iterable(token_sets)), dtype=object)
+        
+        codes, vocab = pd.factorize(tokens, sort=True)
+        
+        # Stable sort by token keeps each posting list in row order
+        order = np.argsort(codes, kind='stable')
+        offsets = np.searchsorted(codes[order], np.arange(len(vocab) + 1))
+        return cls(vocab, offsets, rows[order], len(token_sets))
+
+    @classmethod
+    def from_frame(cls, df, columns, cache_name='word-index'):
+        """Index the given columns of df, reusing the on-disk copy for the loaded dataset."""
+        def build():
+            index = cls.build(searchable_text(df, columns).tolist())
+            return {
+                'vocab': np.array(index.vocab, dtype=str),
+                'offsets': index.offsets,
+                'postings': index.postings
+            }
+        
+        arrays = cached_arrays(cache_name, df.attrs.get('fingerprint'), build, params=[list(columns), INDEX_VERSION])
+        return cls(arrays['vocab'].tolist(), arrays['offsets'], arrays['postings'], len(df))
+
+    def postings_for(self, term, prefix=False):
+        """Sorted row positions containing term (or any token starting with term)."""
+        lo = bisect.bisect_left(self.vocab, term)
+        hi = bisect.bisect_left(self.vocab, term + '\uffff') if prefix else lo + 1
+        hi = min(hi, len(self.vocab))
+        if lo >= hi or (not prefix and self.vocab[lo] != term):
+            return np.array([], dtype=np.int64)
+        if hi - lo == 1:
+            return self.postings[self.offsets[lo]:self.offsets[hi]]
+        
+        # Union of several posting lists through a row bitmap
+        hit = np.zeros(self.n_rows, dtype=bool)
+        hit[self.postings[self.offsets[lo]:self.offsets[hi]]] = True
+        return np.flatnonzero(hit)
+
+    def search(self, query):
+        """Sorted row positions containing every term of query, or None if it has no terms.
+        
+        The last term matches as a prefix so results keep up while a word is typed.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return None
+        
+        lists = [self.postings_for(term) for term in terms[:-1]]
+        lists.append(self.postings_for(terms[-1], prefix=True))
+        
+        # Intersect shortest-first so each step works on the smallest candidate set
+        lists.sort(key=len)
+        result = lists[0]
+        for postings in lists[1:]:
+            result = intersect_sorted(result, postings)
+        return result
+
+
+class TrigramIndex:
+    """Character trigram -> sorted row positions, for exact substring search.
+
+    Trigram postings narrow a query to candidate rows, and a verification pass
+    keeps the rows whose text really contains the query. Results therefore equal
+    a case-insensitive substring test on each field. Queries shorter than three
+    characters scan the rows directly.
+    """
+    
+    def __init__(self, haystack, alphabet, grams, offsets, postings):
+        self.haystack = haystack
+        self.alphabet = alphabet
+        self.grams = grams
+        self.offsets = offsets
+        self.postings = postings
+    
+    @staticmethod
+    def build_arrays(haystack):
+        """Trigram index arrays for a list of lowercase strings (haystack[i] is row position i)."""
+        n_rows = len(haystack)
+        row_sep = '\x01'
+        points = np.frombuffer((row_sep.join(haystack) + row_sep).encode('utf-32-le'), dtype=np.uint32)
+        rows = np.repeat(np.arange(n_rows, dtype=np.int64), [len(text) + 1 for text in haystack])
+        
+        # Trigrams touching a field or row separator can never match a query
+        is_sep = (points == ord(FIELD_SEP)) | (points == ord(row_sep))
+        valid = ~(is_sep[:-2] | is_sep[1:-1] | is_sep[2:])
+        
+        # Compact alphabet so a trigram packs into one small integer
+        alphabet, chars = np.unique(points, return_inverse=True)
+        chars = chars.astype(np.int64)
+        size = len(alphabet)
+        codes = (chars[:-2] * size + chars[1:-1]) * size + chars[2:]
+        
+        # One posting per (trigram, row); sorted pair keys order postings by trigram then row
+        stride = max(n_rows, 1)
+        pairs = np.unique(codes[valid] * stride + rows[:-2][valid])
+        gram_of_pair = pairs // stride
+        grams = np.unique(gram_of_pair)
+        
+        return {
+            'alphabet': alphabet,
+            'grams': grams,
+            'offsets': np.append(np.searchsorted(gram_of_pair, grams), len(pairs)),
+            'postings': pairs % stride
+        }
+    
+    @classmethod
+    def from_frame(cls, df, columns, cache_name='trigram-index'):
+        """Index the given columns of df, reusing the on-disk copy for the loaded dataset."""
+        haystack = searchable_text(df, columns, sep=FIELD_SEP).tolist()
+        arrays = cached_arrays(cache_name, df.attrs.get('fingerprint'), lambda: cls.build_arrays(haystack),
+                               params=[list(columns), INDEX_VERSION])
+        return cls(haystack, arrays['alphabet'], arrays['grams'], arrays['offsets'], arrays['postings'])
+    
+    def candidates(self, query):
+        """Sorted rows that contain every trigram of query, or None if query is too short to narrow."""
+        if len(query) < 3:
+            return None
+        
+        points = np.frombuffer(query.encode('utf-32-le'), dtype=np.uint32)
+        chars = np.searchsorted(self.alphabet, points)
+        if np.any(chars >= len(self.alphabet)) or np.any(self.alphabet[np.minimum(chars, len(self.alphabet) - 1)] != points):
+            return np.array([], dtype=np.int64)
+        
+        size = len(self.alphabet)
+        codes = np.unique((chars[:-2] * size + chars[1:-1]) * size + chars[2:])
+        slots = np.searchsorted(self.grams, codes)
+        if np.any(slots >= len(self.grams)) or np.any(self.grams[np.minimum(slots, len(self.grams) - 1)] != codes):
+            return np.array([], dtype=np.int64)
+        
+        lists = sorted((self.postings[self.offsets[i]:self.offsets[i + 1]] for i in slots), key=len)
+        result = lists[0]
+        for postings in lists[1:]:
+            result = intersect_sorted(result, postings)
+        return result
+    
+    def search(self, query, positions):
+        """The subset of sorted positions whose text contains query (case-insensitive)."""
+        query = query.lower()
+        candidates = self.candidates(query)
+        if candidates is not None:
+            positions = intersect_sorted(positions, candidates)
+            if len(query) == 3:
+                # A single trigram that never spans fields is already an exact match
+                return positions
+        haystack = self.haystack
+        keep = np.fromiter((query in haystack[i] for i in positions), dtype=bool, count=len(positions))
+        return positions[keep]
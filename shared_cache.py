@@ -0,0 +1,128 @@
+"""
+Cross-process result cache for Private Laws Dashboard
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+def cache_key(namespace, *parts):
+    """Stable string key for a namespace and JSON-serializable parts (filter spec, fingerprint, ...)."""
+    digest = hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+class SharedCache:
+    """Size-bounded key/value store in a SQLite file shared by every worker process.
+    
+    WAL journaling lets readers proceed while one process writes, and a busy
+    timeout serializes concurrent writers. Reads only write when an entry's
+    access time is more than touch_interval seconds old, so hot entries are
+    served without taking the write lock. Least recently used entries are
+    evicted once the stored values exceed max_bytes, tracked as a running
+    total in the usage table. Any SQLite error is treated as a cache miss, so
+    a broken cache never breaks a callback.
+    """
+
+    def __init__(self, path, max_bytes=512 * 1024 * 1024, timeout=5.0, touch_interval=60.0):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_bytes // 4
+        self.timeout = timeout
+        self.touch_interval = touch_interval
+        self._local = threading.local()
+        
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS usage (id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER NOT NULL)"
+            )
+            conn.execute("INSERT OR IGNORE INTO usage (id, bytes) SELECT 0, COALESCE(SUM(size), 0) FROM entries")
+
+    def _connection(self):
+        """This thread's connection, reopened after a fork (gunicorn preload) since they cannot be shared."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key):
+        """Stored bytes for key, or None."""
+        try:
+            conn = self._connection()
+            row = conn.execute("SELECT value, accessed FROM entries WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error as e:
+            print(f"⚠ Shared cache read failed: {e}")
+            return None
+        if row is None:
+            return None
+        
+        # Refreshing the LRU position needs the write lock; do it at most once per touch_interval
+        now = time.time()
+        if now - row[1] > self.touch_interval:
+            try:
+                conn.execute("UPDATE entries SET accessed = ? WHERE key = ? AND accessed < ?", (now, key, now))
+            except sqlite3.Error:
+                pass
+        return bytes(row[0])
+
+    def set(self, key, value):
+        """Store bytes for key, then evict least recently used entries beyond max_bytes."""
+        if len(value) > self.max_entry_bytes:
+            return
+        try:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                replaced = conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                    (key, sqlite3.Binary(value), len(value), time.time())
+                )
+                added = len(value) - (replaced[0] if replaced else 0)
+                conn.execute("UPDATE usage SET bytes = bytes + ? WHERE id = 0", (added,))
+                self._evict(conn)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            print(f"⚠ Shared cache write failed: {e}")
+
+    def _evict(self, conn):
+        """Delete oldest entries until the total size fits (runs inside the write transaction)."""
+        total = conn.execute("SELECT bytes FROM usage WHERE id = 0").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        freed = 0
+        stale = []
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed"):
+            if total - freed <= self.max_bytes:
+                break
+            stale.append((key,))
+            freed += size
+        conn.executemany("DELETE FROM entries WHERE key = ?", stale)
+        conn.execute("UPDATE usage SET bytes = bytes - ? WHERE id = 0", (freed,))
+
+    def stats(self):
+        """Entry count and stored bytes."""
+        try:
+            count, size = self._connection().execute(
+                "SELECT COUNT(*), (SELECT bytes FROM usage WHERE id = 0) FROM entries"
+            ).fetchone()
+            return {'entries': count, 'bytes': size}
+        except sqlite3.Error:
+            return {'entries': 0, 'bytes': 0}
@@ -0,0 +1,84 @@
+"""
+Background export jobs waiting for a worker must stay queued, not go stale
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import export_jobs
+from data_loader import generate_sample_data
+from export_jobs import ExportJobs, STALE_SECONDS
+from filter_engine import FilterEngine
+
+
+@pytest.fixture(scope='module')
+def engine():
+    with contextlib.redirect_stdout(io.StringIO()):
+        return FilterEngine(generate_sample_data(500))
+
+
+def backdate(jobs, job_id, seconds):
+    """Make a job's progress file look seconds older than it is."""
+    path = jobs._status_path(job_id)
+    with open(path) as f:
+        status = json.load(f)
+    status['updated'] -= seconds
+    with open(path, 'w') as f:
+        json.dump(status, f)
+
+
+def wait_for(jobs, job_id, state, timeout=10.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if jobs.status(job_id)['state'] == state:
+            return
+        time.sleep(0.01)
+    raise AssertionError(f"{job_id} never reached {state}: {jobs.status(job_id)}")
+
+
+def test_job_waiting_for_worker_stays_queued(engine, tmp_path, monkeypatch):
+    release = threading.Event()
+    real_iter_frames = export_jobs.iter_frames
+
+    def blocking_iter_frames(*args, **kwargs):
+        release.wait(10)
+        yield from real_iter_frames(*args, **kwargs)
+    
+    monkeypatch.setattr(export_jobs, 'iter_frames', blocking_iter_frames)
+    jobs = ExportJobs(engine, str(tmp_path), 'test', max_workers=1)
+    runs = []
+    run = jobs._run
+    jobs._run = lambda job_id, *args: (runs.append(job_id), run(job_id, *args))
+    
+    first = jobs.submit([1789, 1900])
+    wait_for(jobs, first, 'running')
+    second = jobs.submit([1901, 2025])
+    assert jobs.status(second)['state'] == 'queued'
+    
+    # Waiting behind a long export is not a dead job, and resubmitting does not queue it twice
+    backdate(jobs, second, STALE_SECONDS * 2)
+    assert jobs.status(second)['state'] == 'queued'
+    assert jobs.submit([1901, 2025]) == second
+    
+    release.set()
+    wait_for(jobs, first, 'done')
+    wait_for(jobs, second, 'done')
+    assert runs == [first, second]
+    assert os.path.getsize(jobs.artifact_path(second)) == jobs.status(second)['size']
+
+
+def test_running_job_without_progress_is_reported_failed(engine, tmp_path):
+    jobs = ExportJobs(engine, str(tmp_path), 'test', max_workers=1)
+    job_id = jobs.job_id([1789, 2025], None, None, None, 'csv')
+    jobs._write_status(job_id, 'running', 'laws.csv', 'text/csv', 10, 100)
+    backdate(jobs, job_id, STALE_SECONDS * 2)
+    assert jobs.status(job_id)['state'] == 'failed'
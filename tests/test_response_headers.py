@@ -0,0 +1,69 @@
+"""
+Response compression, its per-route counters, and Vary on conditional API responses
+"""
+
+import contextlib
+import gzip
+import io
+import json
+import os
+import sys
+
+import pytest
+from flask import Flask, Response
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api import register_api
+from data_loader import generate_sample_data
+from filter_engine import FilterEngine
+from response_headers import ResponseCompressor, register_response_headers
+from routes import register_metrics
+
+
+@pytest.fixture
+def client():
+    server = Flask(__name__)
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = generate_sample_data(500)
+        engine = FilterEngine(df)
+
+    @server.route('/big')
+    def big():
+        return Response(json.dumps({'values': list(range(2000))}), mimetype='application/json')
+
+    @server.route('/small')
+    def small():
+        return Response('{}', mimetype='application/json')
+    
+    register_api(server, df, engine)
+    compressor = ResponseCompressor(min_bytes=1024)
+    register_response_headers(server, compressor, 3600)
+    register_metrics(server, {'compression': compressor, 'filter_engine': engine})
+    return server.test_client()
+
+
+def test_large_json_is_gzipped_and_counted(client):
+    response = client.get('/big', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert json.loads(gzip.decompress(response.data))['values'][-1] == 1999
+    
+    client.get('/small', headers={'Accept-Encoding': 'gzip'})
+    client.get('/big')
+    stats = client.get('/debug/metrics').get_json()['compression']
+    assert stats['/big']['responses'] == 2
+    assert stats['/big']['compressed'] == 1
+    assert stats['/big']['bytes_saved'] > 0
+    assert stats['/small'] == {'responses': 1, 'compressed': 0, 'bytes_in': 2, 'bytes_saved': 0, 'compress_ms': 0.0}
+
+
+def test_not_modified_api_response_varies_on_encoding(client):
+    response = client.get('/api/stats?group_by=year', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    
+    not_modified = client.get('/api/stats?group_by=year',
+                              headers={'Accept-Encoding': 'gzip', 'If-None-Match': response.headers['ETag']})
+    assert not_modified.status_code == 304
+    assert 'Accept-Encoding' in not_modified.headers['Vary']
+    assert not_modified.headers['ETag'].strip('W/') == response.headers['ETag'].strip('W/')
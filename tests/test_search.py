@@ -0,0 +1,93 @@
+"""
+Substring search through FilterEngine must match a literal pandas str.contains mask
+"""
+
+import contextlib
+import io
+import os
+import random
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_loader import generate_sample_data
+from filter_engine import FilterEngine, SEARCH_COLUMNS
+
+
+# Fixed queries covering the index's special cases: 1-2 characters (no trigrams),
+# exactly 3 (no verification pass), mixed case, date fragments, regex
+# metacharacters, text spanning two fields, missing values and no match
+QUERIES = [
+    'a', 'Z', '1', '-', ' ', 'of', 'Re', '19', 'act', 'ACT', 'smi', '186', '-0', '1862-0', '-12-', '1790-12-19',
+    'relief of', 'An Act for the Relief', 'smith', 'Garcia', 'jones 1799', 'smith\x00', 'housing', 'Defense',
+    'Space, Science', 'for federal', '(', '.', 'a.b', '*', '[a-z]', 'nan', 'none', 'zzzz', 'qxq'
+]
+
+
+@pytest.fixture(scope='module')
+def df():
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = generate_sample_data(3000)
+    # Missing values must never match, not even a search for "nan"
+    df.loc[df.index[::37], 'relief_category'] = np.nan
+    df.loc[df.index[::53], 'title'] = np.nan
+    return df
+
+
+@pytest.fixture(scope='module')
+def engine(df):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return FilterEngine(df)
+
+
+def reference_search(df, positions, query):
+    """Case-insensitive literal substring of any search column, computed with pandas.
+    
+    The original table search used str.contains with its regex=True default;
+    FilterEngine matches queries literally, so this mirrors str.contains with
+    regex=False (metacharacters such as "(" or "." match themselves).
+    """
+    query = query.lower()
+    frame = df.iloc[positions]
+    mask = np.zeros(len(frame), dtype=bool)
+    for col in SEARCH_COLUMNS:
+        values = frame[col].astype(str) if col == 'date' else frame[col].str.lower()
+        mask |= values.str.contains(query, regex=False, na=False).to_numpy()
+    return positions[mask]
+
+
+def sampled_queries(df, n=60, seed=7):
+    """Random substrings of the searched fields, in random case."""
+    rng = random.Random(seed)
+    fields = [v for col in SEARCH_COLUMNS for v in df[col].dropna().astype(str).tolist() if v]
+    queries = []
+    for _ in range(n):
+        text = rng.choice(fields)
+        start = rng.randrange(len(text))
+        piece = text[start:start + rng.randint(1, 12)]
+        queries.append(''.join(c.upper() if rng.random() < 0.3 else c for c in piece))
+    return queries
+
+
+@pytest.mark.parametrize('query', QUERIES)
+def test_search_matches_reference(df, engine, query):
+    positions = engine.select([1789, 2025])
+    np.testing.assert_array_equal(engine.select([1789, 2025], search=query), reference_search(df, positions, query))
+
+
+def test_sampled_queries_match_reference(df, engine):
+    positions = engine.select([1789, 2025])
+    for query in sampled_queries(df):
+        expected = reference_search(df, positions, query)
+        np.testing.assert_array_equal(engine.select([1789, 2025], search=query), expected, err_msg=repr(query))
+
+
+@pytest.mark.parametrize('year_range, subject', [([1850, 1900], None), ([1920, 1970], 'Defense'), ([2024, 2024], None)])
+def test_search_within_filters_matches_reference(df, engine, year_range, subject):
+    positions = engine.select(year_range, subject)
+    for query in ['act', 'smith', '19', 'e', 'defense', '-05-']:
+        expected = reference_search(df, positions, query)
+        np.testing.assert_array_equal(engine.select(year_range, subject, search=query), expected, err_msg=repr(query))